@@ -1,57 +1,38 @@
-import zipfile
-import xml.etree.ElementTree as ET
-import sys
+import math
+import argparse
 
-def parse_xlsx(file_path):
-    try:
-        with zipfile.ZipFile(file_path, 'r') as z:
-            strings = []
-            if 'xl/sharedStrings.xml' in z.namelist():
-                root = ET.parse(z.open('xl/sharedStrings.xml')).getroot()
-                ns = {'ns': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
-                strings = [t.text if t is not None else "" for t in root.findall('ns:si/ns:t', ns)]
+from session_table import add_range_args, resolve_range, iter_export_rows, find_column, parse_timestamp
+
+def in_range(ts, start, end):
+    return not math.isnan(ts) and (start is None or ts >= start) and (end is None or ts < end)
 
-            if 'xl/worksheets/sheet1.xml' in z.namelist():
-                root = ET.parse(z.open('xl/worksheets/sheet1.xml')).getroot()
-                ns = {'ns': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
-                
-                rows_iter = root.find('ns:sheetData', ns).findall('ns:row', ns)
-                
-                # Header
-                header = []
-                for c in rows_iter[0].findall('ns:c', ns):
-                    val = ""
-                    v = c.find('ns:v', ns)
-                    if v is not None:
-                        if c.get('t')=='s': val = strings[int(v.text)]
-                        else: val = v.text
-                    header.append(val)
+def parse_xlsx(file_path, start=None, end=None):
+    try:
+        rows = iter_export_rows(file_path)
+        header = next(rows, None)
+        if header is None: return
+        columns = [find_column(header, name) for name in ('created_at', 'updated_at')]
 
-                # Find first match for 2025-12
-                for row in rows_iter[1:]:
-                    r = []
-                    for c in row.findall('ns:c', ns):
-                        val = ""
-                        v = c.find('ns:v', ns)
-                        if v is not None:
-                            if c.get('t')=='s': 
-                                try: val = strings[int(v.text)]
-                                except: val = ""
-                            else: val = v.text
-                        r.append(val)
-                    
-                    if any('2025-12-11' in str(x) or '2025-12-12' in str(x) for x in r):
-                        print("--- MATCHED ROW MAPPING ---")
-                        for i, val in enumerate(r):
-                            h_name = header[i] if i < len(header) else f"Col_{i}"
-                            print(f"{i} [{h_name}]: {val}")
-                        # Found one, verifying the 3611 case if possible
-                        if '3611.0' in r:
-                            print("\n!!! FOUND THE 60-MIN SESSION !!!")
-                        break
+        # Find the first row created or updated inside the range
+        for r in rows:
+            stamps = [parse_timestamp(r[i]) for i in columns if 0 <= i < len(r)]
+            if any(in_range(ts, start, end) for ts in stamps):
+                print("--- MATCHED ROW MAPPING ---")
+                for i, val in enumerate(r):
+                    h_name = header[i] if i < len(header) else f"Col_{i}"
+                    print(f"{i} [{h_name}]: {val}")
+                # Found one, verifying the 3611 case if possible
+                if '3611.0' in r:
+                    print("\n!!! FOUND THE 60-MIN SESSION !!!")
+                break
 
     except Exception as e:
         print(f"Error: {e}")
 
 if __name__ == "__main__":
-    parse_xlsx(sys.argv[1])
+    parser = argparse.ArgumentParser(description="Print the column mapping of the first session (in a date range, if given).")
+    parser.add_argument("file_path")
+    add_range_args(parser)
+    args = parser.parse_args()
+    start, end, _ = resolve_range(args)
+    parse_xlsx(args.file_path, start, end)
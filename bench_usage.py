@@ -0,0 +1,222 @@
+import os
+import sys
+import json
+import time
+import tempfile
+import argparse
+import multiprocessing
+
+import synthetic_export
+
+try:
+    import resource
+except ImportError:  # Windows: fall back to Python-heap peak via tracemalloc
+    resource = None
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+
+# ============= BENCHMARK CASES =============
+# Each case receives the generated export paths and a scratch cache dir and
+# returns (rows_processed, seconds). Setup that is not being measured (for
+# example loading the table before an aggregation) happens before the timer.
+
+def _timed(fn):
+    t0 = time.perf_counter()
+    rows = fn()
+    return rows, time.perf_counter() - t0
+
+
+def case_iter_rows(paths, cache_dir):
+    from xlsx_reader import iter_rows
+    return _timed(lambda: sum(1 for _ in iter_rows(paths['xlsx'])) - 1)
+
+
+class _LineCounter:
+    """stdout sink that counts lines without keeping the output."""
+
+    def __init__(self):
+        self.lines = 0
+
+    def write(self, s):
+        self.lines += s.count('\n')
+
+    def flush(self):
+        pass
+
+
+def case_read_xlsx_std(paths, cache_dir):
+    import contextlib
+    from read_xlsx_std import read_xlsx
+    sink = _LineCounter()
+
+    def run():
+        with contextlib.redirect_stdout(sink):
+            read_xlsx(paths['xlsx'])
+        return sink.lines - 1
+    return _timed(run)
+
+
+def case_load_xlsx(paths, cache_dir):
+    from session_table import load_sessions
+    return _timed(lambda: len(load_sessions(paths['xlsx'])))
+
+
+def case_load_csv(paths, cache_dir):
+    from session_table import load_sessions
+    return _timed(lambda: len(load_sessions(paths['csv'])))
+
+
+def case_analyze_csv_dump(paths, cache_dir):
+    import contextlib
+    os.environ['USAGE_CACHE'] = '0'
+    from analyze_csv_dump import analyze
+    sink = _LineCounter()
+
+    def run():
+        with contextlib.redirect_stdout(sink):
+            analyze(paths['csv'])
+        return sink.lines - 7
+    return _timed(run)
+
+
+def case_cache_cold(paths, cache_dir):
+    from session_cache import load_sessions
+    return _timed(lambda: len(load_sessions(paths['xlsx'], cache_dir=cache_dir, refresh=True)))
+
+
+def case_cache_warm(paths, cache_dir):
+    from session_cache import load_sessions
+    load_sessions(paths['xlsx'], cache_dir=cache_dir)
+    return _timed(lambda: len(load_sessions(paths['xlsx'], cache_dir=cache_dir)))
+
+
+def _warm_table(paths, cache_dir):
+    from session_cache import load_sessions
+    return load_sessions(paths['xlsx'], cache_dir=cache_dir)
+
+
+def case_duration_by(paths, cache_dir):
+    table = _warm_table(paths, cache_dir)
+
+    def run():
+        for column in ('status', 'replica_uuid', 'persona_uuid'):
+            table.duration_by(column)
+        return len(table)
+    return _timed(run)
+
+
+def case_range_rollup(paths, cache_dir):
+    table = _warm_table(paths, cache_dir)
+
+    def run():
+        index = table.index()
+        index.rollup(index.keys[0], index.keys[-1] + 1, 'day')
+        return len(table)
+    return _timed(run)
+
+
+def case_concurrency(paths, cache_dir):
+    from concurrency import intervals, peak_concurrency
+    table = _warm_table(paths, cache_dir)
+
+    def run():
+        peak_concurrency(*intervals(table))
+        return len(table)
+    return _timed(run)
+
+
+CASES = {
+    'iter_rows': case_iter_rows,
+    'read_xlsx_std': case_read_xlsx_std,
+    'load_xlsx': case_load_xlsx,
+    'load_csv': case_load_csv,
+    'analyze_csv_dump': case_analyze_csv_dump,
+    'cache_cold': case_cache_cold,
+    'cache_warm': case_cache_warm,
+    'duration_by': case_duration_by,
+    'range_rollup': case_range_rollup,
+    'concurrency': case_concurrency,
+}
+
+
+# ============= HARNESS =============
+
+def _peak_rss_mb():
+    if resource is None:
+        import tracemalloc
+        return tracemalloc.get_traced_memory()[1] / (1 << 20)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KB on Linux, bytes on macOS
+    return peak / (1 << 20) if sys.platform == 'darwin' else peak / 1024
+
+
+def _child(name, paths, cache_dir, queue):
+    if resource is None:
+        import tracemalloc
+        tracemalloc.start()
+    try:
+        rows, seconds = CASES[name](paths, cache_dir)
+        queue.put({'rows': rows, 'seconds': seconds, 'peak_rss_mb': _peak_rss_mb()})
+    except Exception as e:
+        queue.put({'error': str(e)})
+
+
+def run_case(name, paths, cache_dir):
+    """Run one case in a fresh spawned process so peak RSS is not shared between cases."""
+    ctx = multiprocessing.get_context('spawn')
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_child, args=(name, paths, cache_dir, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def generate(size, data_dir):
+    """Generate (or reuse) the xlsx and UTF-16 CSV exports for a size."""
+    paths = {'xlsx': os.path.join(data_dir, f'synthetic_{size}.xlsx'),
+             'csv': os.path.join(data_dir, f'synthetic_{size}.csv')}
+    if not os.path.exists(paths['xlsx']):
+        print(f"Generating {size:,}-row xlsx...", file=sys.stderr)
+        synthetic_export.write_xlsx(paths['xlsx'], size)
+    if not os.path.exists(paths['csv']):
+        print(f"Generating {size:,}-row csv...", file=sys.stderr)
+        synthetic_export.write_csv(paths['csv'], size)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the usage parsers and aggregations on synthetic exports.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), default=list(CASES))
+    parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), 'tavus_usage_bench'),
+                        help="Where generated exports are kept between runs")
+    parser.add_argument("--json", help="Also write results to this JSON file")
+    args = parser.parse_args()
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    results = []
+    print(f"{'Case':<18} | {'Rows':>10} | {'Wall (s)':>9} | {'Rows/s':>12} | {'Peak RSS (MB)':>13}")
+    print("-" * 73)
+    for size in args.sizes:
+        paths = generate(size, args.data_dir)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            for name in args.cases:
+                r = run_case(name, paths, cache_dir)
+                r.update({'case': name, 'size': size})
+                results.append(r)
+                if 'error' in r:
+                    print(f"{name:<18} | {size:>10,} | ERROR: {r['error']}")
+                    continue
+                rate = r['rows'] / r['seconds'] if r['seconds'] else float('inf')
+                print(f"{name:<18} | {size:>10,} | {r['seconds']:>9.3f} | {rate:>12,.0f} | {r['peak_rss_mb']:>13.1f}")
+        print("-" * 73)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
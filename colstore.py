@@ -0,0 +1,145 @@
+"""Minimal columnar binary container used for the usage caches and exports.
+
+Layout: an 8-byte magic, then one or more blocks. Each block is an 8-byte
+little-endian header length, a JSON header describing the columns, and the
+raw column buffers (8-byte aligned) in header order. Numeric columns are
+stored as raw machine arrays, string columns as an int64 offset array plus
+one UTF-8 buffer, and category columns as int32 codes plus the value table
+in the header. Readers map the file and copy buffers straight into arrays.
+"""
+
+import sys
+import json
+import mmap
+import array
+import struct
+
+MAGIC = b'TVCOL1\x00\x00'
+ALIGN = 8
+
+
+def _pad(n):
+    return (-n) % ALIGN
+
+
+def encode_strings(values):
+    """Pack strings into (int64 offsets, utf-8 buffer)."""
+    offsets = array.array('q', [0])
+    chunks = []
+    total = 0
+    for v in values:
+        b = v.encode('utf-8')
+        chunks.append(b)
+        total += len(b)
+        offsets.append(total)
+    return offsets, b''.join(chunks)
+
+
+def decode_strings(offsets, buf):
+    return [buf[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(len(offsets) - 1)]
+
+
+def write_block(f, columns, rows, meta=None):
+    """Write one block. columns: list of (name, kind, data) where kind is
+    'd'/'i'/'q' (data is an array), 'str' (list of str) or 'cat' ((values, codes))."""
+    specs = []
+    buffers = []
+    for name, kind, data in columns:
+        spec = {'name': name, 'kind': kind}
+        if kind == 'str':
+            offsets, blob = encode_strings(data)
+            parts = [offsets.tobytes(), blob]
+        elif kind == 'cat':
+            values, codes = data
+            spec['values'] = list(values)
+            parts = [array.array('i', codes).tobytes()]
+        else:
+            parts = [array.array(kind, data).tobytes()]
+        spec['nbytes'] = [len(p) for p in parts]
+        specs.append(spec)
+        buffers.extend(parts)
+
+    header = json.dumps({'rows': rows, 'byteorder': sys.byteorder,
+                         'columns': specs, 'meta': meta or {}}).encode('utf-8')
+    header += b' ' * _pad(len(header))
+    f.write(struct.pack('<Q', len(header)))
+    f.write(header)
+    for b in buffers:
+        f.write(b)
+        f.write(b'\x00' * _pad(len(b)))
+
+
+def _array(kind, buf, swap):
+    a = array.array(kind)
+    a.frombytes(buf)
+    if swap:
+        a.byteswap()
+    return a
+
+
+def iter_blocks(path):
+    """Yield (meta, rows, {name: column}) for each block in a file."""
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a colstore file")
+        f.seek(0, 2)
+        if f.tell() == len(MAGIC):
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = len(MAGIC)
+            while pos < len(mm):
+                (hlen,) = struct.unpack_from('<Q', mm, pos)
+                pos += 8
+                header = json.loads(bytes(mm[pos:pos + hlen]))
+                pos += hlen
+                swap = header['byteorder'] != sys.byteorder
+                cols = {}
+                for spec in header['columns']:
+                    parts = []
+                    for n in spec['nbytes']:
+                        parts.append(mm[pos:pos + n])
+                        pos += n + _pad(n)
+                    kind = spec['kind']
+                    if kind == 'str':
+                        cols[spec['name']] = decode_strings(_array('q', parts[0], swap), parts[1])
+                    elif kind == 'cat':
+                        cols[spec['name']] = (spec['values'], _array('i', parts[0], swap))
+                    else:
+                        cols[spec['name']] = _array(kind, parts[0], swap)
+                yield header['meta'], header['rows'], cols
+
+
+def write_file(path, columns, rows, meta=None):
+    with open(path, 'wb') as f:
+        f.write(MAGIC)
+        write_block(f, columns, rows, meta)
+
+
+def read_file(path):
+    """Read a single-block file: (meta, rows, columns)."""
+    for block in iter_blocks(path):
+        return block
+    raise ValueError(f"{path} has no blocks")
+
+
+def read_meta(path):
+    """Header metadata of the first block, without touching the column buffers."""
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a colstore file")
+        (hlen,) = struct.unpack('<Q', f.read(8))
+        return json.loads(f.read(hlen))['meta']
+
+
+def iter_rows(path):
+    """Yield the header and then each row of a row-group export written by dump_csv.py."""
+    header = None
+    for meta, rows, cols in iter_blocks(path):
+        if header is None:
+            header = meta.get('header')
+            if header is None:
+                raise ValueError(f"{path} is not a row export")
+            yield header
+        columns = [cols[str(i)] for i in range(len(header))]
+        for i in range(rows):
+            yield [col[i] for col in columns]
@@ -0,0 +1,113 @@
+import math
+import array
+import argparse
+
+from ingest import ingest
+from session_table import add_range_args, resolve_range, format_timestamp
+
+
+def intervals(table, start=None, end=None):
+    """Sorted start and end arrays of created_at -> updated_at, clipped to [start, end)."""
+    lo = -math.inf if start is None else start
+    hi = math.inf if end is None else end
+    starts = array.array('d')
+    ends = array.array('d')
+    for s, e in zip(table.created_at, table.updated_at):
+        # NaN compares false, so rows missing either timestamp drop out here
+        s, e = max(s, lo), min(e, hi)
+        if s < e:
+            starts.append(s)
+            ends.append(e)
+    return array.array('d', sorted(starts)), array.array('d', sorted(ends))
+
+
+def steps(starts, ends):
+    """Sweep the sorted endpoints, yielding (t, level) at each change point.
+
+    Intervals are half-open, so at equal timestamps ends are applied before
+    starts and back-to-back sessions never count as overlapping.
+    """
+    i = j = level = 0
+    n, m = len(starts), len(ends)
+    while i < n or j < m:
+        if j >= m or (i < n and starts[i] < ends[j]):
+            t = starts[i]
+            level += 1
+            i += 1
+        else:
+            t = ends[j]
+            level -= 1
+            j += 1
+        yield t, level
+
+
+def segments(starts, ends):
+    """Yield (t0, t1, level) for each constant-level stretch of the step function."""
+    prev_t = prev_level = None
+    for t, level in steps(starts, ends):
+        if prev_t is not None and t > prev_t:
+            yield prev_t, t, prev_level
+        prev_t, prev_level = t, level
+
+
+def peak_concurrency(starts, ends):
+    """(peak, first time it was reached)."""
+    peak, at = 0, None
+    for t0, _, level in segments(starts, ends):
+        if level > peak:
+            peak, at = level, t0
+    return peak, at
+
+
+def time_at_or_above(starts, ends, threshold):
+    """Seconds during which at least `threshold` sessions were open."""
+    return math.fsum(t1 - t0 for t0, t1, level in segments(starts, ends) if level >= threshold)
+
+
+def concurrency_series(starts, ends, resolution=60.0, start=None, end=None):
+    """[(bucket_start, max_level, mean_level)] over fixed-width buckets.
+
+    mean_level is time-weighted, i.e. session-seconds in the bucket / resolution.
+    """
+    if not len(starts):
+        return []
+    origin = math.floor((starts[0] if start is None else start) / resolution) * resolution
+    stop = ends[-1] if end is None else end
+    nbuckets = max(1, math.ceil((stop - origin) / resolution))
+    peak = [0] * nbuckets
+    area = [0.0] * nbuckets
+    for t0, t1, level in segments(starts, ends):
+        if level == 0:
+            continue
+        b = int((t0 - origin) // resolution)
+        while t0 < t1 and b < nbuckets:
+            edge = min(t1, origin + (b + 1) * resolution)
+            peak[b] = max(peak[b], level)
+            area[b] += (edge - t0) * level
+            t0 = edge
+            b += 1
+    return [(origin + b * resolution, peak[b], area[b] / resolution) for b in range(nbuckets)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Peak and time-at-threshold concurrency of Tavus sessions.")
+    parser.add_argument("paths", nargs="+", help="xlsx/csv exports, directories or glob patterns")
+    add_range_args(parser)
+    parser.add_argument("--threshold", type=int, default=1, help="Report minutes with at least this many sessions open")
+    parser.add_argument("--resolution", type=float, default=0, help="Print a concurrency series with buckets of this many seconds")
+    parser.add_argument("--workers", type=int, help="Worker processes for multi-file ingestion")
+    args = parser.parse_args()
+
+    start, end, tz = resolve_range(args)
+    starts, ends = intervals(ingest(args.paths, args.workers, verbose=False), start, end)
+    peak, at = peak_concurrency(starts, ends)
+    print(f"Sessions: {len(starts)}")
+    print(f"Peak Concurrency: {peak}" + (f" (first at {format_timestamp(at, tz)})" if at is not None else ""))
+    print(f"Time at >= {args.threshold}: {time_at_or_above(starts, ends, args.threshold)/60:.1f} minutes")
+
+    if args.resolution:
+        print(f"\n--- CONCURRENCY ({args.resolution:g}s buckets) ---")
+        print(f"{'Bucket':<26} | {'Max':>4} | {'Mean':>6}")
+        for bucket, level, mean in concurrency_series(starts, ends, args.resolution, start, end):
+            if level:
+                print(f"{format_timestamp(bucket, tz)[:26]:<26} | {level:>4} | {mean:>6.2f}")
@@ -1,39 +1,77 @@
-import zipfile
-import xml.etree.ElementTree as ET
 import sys
+import csv
+import argparse
 
-def dump_csv(file_path):
-    try:
-        with zipfile.ZipFile(file_path, 'r') as z:
-            strings = []
-            if 'xl/sharedStrings.xml' in z.namelist():
-                root = ET.parse(z.open('xl/sharedStrings.xml')).getroot()
-                # Remove namespaces for easier find
-                for elem in root.iter():
-                    if '}' in elem.tag: elem.tag = elem.tag.split('}', 1)[1]
-                strings = [t.text if t is not None else "" for t in root.findall('si/t')]
-
-            if 'xl/worksheets/sheet1.xml' in z.namelist():
-                root = ET.parse(z.open('xl/worksheets/sheet1.xml')).getroot()
-                for elem in root.iter():
-                    if '}' in elem.tag: elem.tag = elem.tag.split('}', 1)[1]
-                
-                rows = []
-                for row in root.find('sheetData').findall('row'):
-                    r = []
-                    for c in row.findall('c'):
-                        val = ""
-                        v = c.find('v')
-                        if v is not None and v.text is not None:
-                            if c.get('t')=='s': 
-                                try: val = strings[int(v.text)]
-                                except: val = f"ERR:{v.text}"
-                            else: val = v.text
-                        r.append(val)
-                    print(",".join(f'"{x}"' for x in r))
+import colstore
+from xlsx_reader import iter_rows, SHEET1
 
-    except Exception as e:
-        print(f"Error: {e}")
+# analyze_csv_dump.py / session_table detect UTF-16 and UTF-8 from the BOM,
+# so only BOM-carrying encodings are offered
+ENCODINGS = {'utf-16': 'utf-16', 'utf-8': 'utf-8-sig'}
+ROW_GROUP = 65536
+BUFFER_SIZE = 1 << 20
+
+def padded_rows(rows):
+    """Header, then every row padded to the header width (Excel omits trailing empty cells)."""
+    header = next(rows, None)
+    if header is None: return
+    yield header
+    width = len(header)
+    for r in rows:
+        yield r + [""] * (width - len(r)) if len(r) < width else r
+
+def dump_csv(file_path, out=None, encoding='utf-16', sheet=SHEET1):
+    """Stream sheet rows as RFC-4180 CSV (every field quoted, embedded quotes doubled)."""
+    rows = padded_rows(iter_rows(file_path, sheet))
+    if out is None:
+        csv.writer(sys.stdout, quoting=csv.QUOTE_ALL).writerows(rows)
+        return
+    with open(out, 'w', encoding=ENCODINGS[encoding], newline='', buffering=BUFFER_SIZE) as f:
+        csv.writer(f, quoting=csv.QUOTE_ALL).writerows(rows)
+
+def write_row_group(f, header, buffers, count):
+    # Columns are keyed by position since header cells may repeat or be blank
+    columns = [(str(i), 'str', b) for i, b in enumerate(buffers)]
+    colstore.write_block(f, columns, count, {'header': header})
+
+def dump_columnar(file_path, out, sheet=SHEET1, row_group=ROW_GROUP):
+    """Stream sheet rows into a colstore file, one block per row_group rows."""
+    rows = iter_rows(file_path, sheet)
+    header = next(rows, None)
+    if header is None: return
+    width = len(header)
+    with open(out, 'wb', buffering=BUFFER_SIZE) as f:
+        f.write(colstore.MAGIC)
+        buffers = [[] for _ in range(width)]
+        count = 0
+        for r in rows:
+            # Trailing empty cells are omitted by Excel; pad to the header width
+            for i in range(width):
+                buffers[i].append(r[i] if i < len(r) else "")
+            count += 1
+            if count == row_group:
+                write_row_group(f, header, buffers, count)
+                buffers = [[] for _ in range(width)]
+                count = 0
+        if count or f.tell() == len(colstore.MAGIC):
+            write_row_group(f, header, buffers, count)
 
 if __name__ == "__main__":
-    dump_csv(sys.argv[1])
+    parser = argparse.ArgumentParser(description="Export an xlsx sheet as CSV or a columnar .tvcol file.")
+    parser.add_argument("file_path")
+    parser.add_argument("-o", "--out", help="Output file (CSV defaults to stdout)")
+    parser.add_argument("--format", choices=("csv", "tvcol"), default="csv")
+    parser.add_argument("--encoding", choices=sorted(ENCODINGS), default="utf-16", help="CSV encoding (default utf-16)")
+    parser.add_argument("--sheet", default=SHEET1, help="Worksheet part inside the xlsx")
+    args = parser.parse_args()
+
+    try:
+        if args.format == "tvcol":
+            if not args.out: parser.error("--format tvcol needs --out")
+            dump_columnar(args.file_path, args.out, args.sheet)
+        else:
+            dump_csv(args.file_path, args.out, args.encoding, args.sheet)
+
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,99 @@
+import os
+import sys
+import glob
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from xlsx_reader import list_sheets
+from session_cache import load_sessions, save_table
+from session_table import SessionTable, add_range_args, resolve_range, print_summary
+
+EXPORT_EXTENSIONS = ('.xlsx', '.csv', '.tvcol')
+
+
+def discover(paths):
+    """Expand files, directories (recursively) and glob patterns into export files."""
+    found = []
+    for p in paths:
+        if os.path.isdir(p):
+            for root, dirs, filenames in os.walk(p):
+                dirs[:] = [d for d in dirs if not d.startswith('.')]
+                found.extend(os.path.join(root, f) for f in filenames
+                             if f.lower().endswith(EXPORT_EXTENSIONS) and not f.startswith('~$'))
+        elif os.path.isfile(p):
+            found.append(p)
+        else:
+            found.extend(f for f in glob.glob(p, recursive=True)
+                         if f.lower().endswith(EXPORT_EXTENSIONS))
+    # The same file reached through two arguments is only read once
+    unique = {}
+    for f in found:
+        unique.setdefault(os.path.abspath(f), f)
+    return sorted(unique.values())
+
+
+def plan_tasks(files):
+    """One (file, sheet_part) task per CSV/.tvcol file and per worksheet, largest files first."""
+    tasks = []
+    for f in sorted(files, key=os.path.getsize, reverse=True):
+        if not f.lower().endswith('.xlsx'):
+            tasks.append((f, None))
+        else:
+            tasks.extend((f, part) for _, part in list_sheets(f))
+    return tasks
+
+
+def _load_task(task):
+    file_path, sheet = task
+    try:
+        return task, load_sessions(file_path, sheet), None
+    except Exception as e:
+        return task, None, str(e)
+
+
+def ingest(paths, workers=None, verbose=True):
+    """Load every sheet of every export under paths into one table deduplicated by uuid."""
+    tasks = plan_tasks(discover(paths))
+    merged = SessionTable()
+    if not tasks:
+        return merged
+
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    if workers == 1:
+        results = map(_load_task, tasks)
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        results = pool.map(_load_task, tasks)
+
+    for (file_path, sheet), table, error in results:
+        label = f"{file_path}" + (f" [{sheet}]" if sheet else "")
+        if error:
+            print(f"Skipped {label}: {error}", file=sys.stderr)
+            continue
+        # Sheets without a uuid column are not conversation exports
+        if not any(table.uuid):
+            continue
+        if verbose:
+            print(f"Loaded {len(table):>8} rows from {label}", file=sys.stderr)
+        merged.extend(table)
+
+    if workers > 1:
+        pool.shutdown()
+    return merged.deduplicated()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Merge many Tavus exports (all sheets) into one deduplicated session table.")
+    parser.add_argument("paths", nargs="+", help="Export files, directories or glob patterns")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--out", help="Write the merged table to this colstore (.tvcol) file")
+    add_range_args(parser)
+    args = parser.parse_args()
+
+    table = ingest(args.paths, args.workers)
+    start, end, tz = resolve_range(args)
+    if start is not None or end is not None:
+        table = table.between(start, end)
+    if args.out:
+        save_table(args.out, table)
+    print_summary(table)
@@ -0,0 +1,99 @@
+import os
+import json
+import hashlib
+
+import colstore
+from session_table import build_table, iter_export_rows, is_session_table, load_table, save_table
+
+# Bump whenever parsing semantics change so old cache files are ignored
+PARSER_VERSION = 4
+
+CACHE_DIR = os.environ.get(
+    'USAGE_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.usage_cache'))
+INDEX_FILE = 'index.json'
+
+
+def file_digest(file_path, chunk_size=1 << 20):
+    """sha256 of a file's contents, read in 1 MB chunks."""
+    h = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _load_index(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, INDEX_FILE), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_index(cache_dir, index):
+    # Per-process temp name: ingest.py workers may save concurrently
+    tmp = os.path.join(cache_dir, f"{INDEX_FILE}.{os.getpid()}.tmp")
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=1)
+    os.replace(tmp, os.path.join(cache_dir, INDEX_FILE))
+
+
+def source_digest(file_path, cache_dir=CACHE_DIR):
+    """Content hash of the export, reusing the last hash while size and mtime are unchanged."""
+    st = os.stat(file_path)
+    key = os.path.abspath(file_path)
+    index = _load_index(cache_dir)
+    entry = index.get(key)
+    if entry and entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns:
+        return entry['digest']
+    digest = file_digest(file_path)
+    if os.path.isdir(cache_dir):
+        index[key] = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'digest': digest}
+        _save_index(cache_dir, index)
+    return digest
+
+
+def cache_key(digest, sheet=None):
+    return hashlib.sha256(f"{digest}:{sheet or ''}:v{PARSER_VERSION}".encode()).hexdigest()[:32]
+
+
+def _prune(cache_dir, source, sheet, keep):
+    # Drop entries cached from an older version of the same source/sheet
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        if not name.endswith('.tvcol') or path == keep:
+            continue
+        try:
+            meta = colstore.read_meta(path)
+            if meta.get('source') == source and meta.get('sheet') == sheet:
+                os.remove(path)
+        except (OSError, ValueError):
+            pass
+
+
+def load_sessions(file_path, sheet=None, cache_dir=CACHE_DIR, refresh=False):
+    """load_sessions with a persistent cache keyed by content hash and PARSER_VERSION.
+
+    Set USAGE_CACHE=0 to bypass the cache entirely.
+    """
+    if is_session_table(file_path):
+        return load_table(file_path)
+    if os.environ.get('USAGE_CACHE') == '0':
+        return build_table(iter_export_rows(file_path, sheet))
+
+    os.makedirs(cache_dir, exist_ok=True)
+    digest = source_digest(file_path, cache_dir)
+    path = os.path.join(cache_dir, cache_key(digest, sheet) + '.tvcol')
+    if not refresh and os.path.exists(path):
+        try:
+            return load_table(path)
+        except (OSError, ValueError, KeyError):
+            pass  # unreadable cache file: rebuild below
+
+    table = build_table(iter_export_rows(file_path, sheet))
+    source = os.path.abspath(file_path)
+    save_table(path, table, {'source': source, 'sheet': sheet, 'digest': digest,
+                             'parser_version': PARSER_VERSION})
+    _prune(cache_dir, source, sheet, path)
+    return table
@@ -0,0 +1,468 @@
+import os
+import sys
+import csv
+import math
+import array
+import bisect
+import datetime
+from itertools import accumulate
+
+import colstore
+from xlsx_reader import iter_rows
+
+CATEGORY_COLUMNS = ('status', 'replica_uuid', 'persona_uuid')
+TIMESTAMP_COLUMNS = ('created_at', 'updated_at')
+# Empty columns the older UTF-16 dumps left out of every row
+LEGACY_DROPPED_COLUMNS = ('context_override', 'webhook_url')
+
+# Excel serial dates count days from 1899-12-30
+EXCEL_EPOCH = datetime.datetime(1899, 12, 30, tzinfo=datetime.timezone.utc)
+UNIX_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+EXCEL_EPOCH_OFFSET = (UNIX_EPOCH - EXCEL_EPOCH).total_seconds()
+
+
+def parse_timestamp(value):
+    """Parse an ISO-8601 string or Excel serial date into UTC epoch seconds (NaN if empty/bad)."""
+    if value is None or value == "":
+        return math.nan
+    try:
+        return float(value) * 86400.0 - EXCEL_EPOCH_OFFSET
+    except ValueError:
+        pass
+    if value.endswith(('Z', 'z')):
+        # fromisoformat only accepts a 'Z' suffix from Python 3.11 on
+        value = value[:-1] + '+00:00'
+    try:
+        dt = datetime.datetime.fromisoformat(value)
+    except ValueError:
+        return math.nan
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=datetime.timezone.utc)
+    return dt.timestamp()
+
+
+def format_timestamp(ts, tz=datetime.timezone.utc):
+    """Inverse of parse_timestamp, for display."""
+    if math.isnan(ts):
+        return "?"
+    return datetime.datetime.fromtimestamp(ts, tz).isoformat()
+
+
+def parse_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class Category:
+    """Dictionary-encoded string column: an int code per row into a table of distinct values."""
+
+    def __init__(self, values=None, codes=None):
+        self.values = list(values or [])
+        self.codes = codes if codes is not None else array.array('i')
+        self._index = {v: i for i, v in enumerate(self.values)}
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, i):
+        return self.values[self.codes[i]]
+
+    def intern(self, value):
+        """Code for a value, adding it to the value table if new."""
+        code = self._index.get(value)
+        if code is None:
+            code = self._index[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def append(self, value):
+        self.codes.append(self.intern(value))
+
+    def code(self, value):
+        """Code for a value, or -1 if it never occurs."""
+        return self._index.get(value, -1)
+
+    def take(self, indices):
+        return Category(self.values, array.array('i', [self.codes[i] for i in indices]))
+
+
+class SessionTable:
+    """Columnar table of Tavus conversation sessions.
+
+    Timestamps are UTC epoch seconds and durations are seconds, both held in
+    float arrays; status, replica_uuid and persona_uuid are dictionary-encoded.
+    Everything is parsed once at load time, so aggregations never touch strings.
+    """
+
+    def __init__(self):
+        self.uuid = []
+        self.created_at = array.array('d')
+        self.updated_at = array.array('d')
+        self.duration = array.array('d')
+        self.status = Category()
+        self.replica_uuid = Category()
+        self.persona_uuid = Category()
+        self._indexes = {}
+
+    def __len__(self):
+        return len(self.uuid)
+
+    def append(self, uuid, created_at, updated_at, duration, status, replica_uuid, persona_uuid):
+        self.uuid.append(uuid)
+        self.created_at.append(created_at)
+        self.updated_at.append(updated_at)
+        self.duration.append(duration)
+        self.status.append(status)
+        self.replica_uuid.append(replica_uuid)
+        self.persona_uuid.append(persona_uuid)
+        self._indexes.clear()
+
+    def row(self, i):
+        return {
+            'uuid': self.uuid[i],
+            'created_at': self.created_at[i],
+            'updated_at': self.updated_at[i],
+            'duration': self.duration[i],
+            'status': self.status[i],
+            'replica_uuid': self.replica_uuid[i],
+            'persona_uuid': self.persona_uuid[i],
+        }
+
+    def take(self, indices):
+        """New table holding only the given row positions, in that order."""
+        indices = list(indices)
+        out = SessionTable()
+        out.uuid = [self.uuid[i] for i in indices]
+        for name in ('created_at', 'updated_at', 'duration'):
+            col = getattr(self, name)
+            setattr(out, name, array.array('d', [col[i] for i in indices]))
+        for name in CATEGORY_COLUMNS:
+            setattr(out, name, getattr(self, name).take(indices))
+        return out
+
+    def extend(self, other):
+        """Append all rows of another table, re-encoding its category codes."""
+        self.uuid.extend(other.uuid)
+        for name in ('created_at', 'updated_at', 'duration'):
+            getattr(self, name).extend(getattr(other, name))
+        for name in CATEGORY_COLUMNS:
+            mine, theirs = getattr(self, name), getattr(other, name)
+            remap = [mine.intern(value) for value in theirs.values]
+            mine.codes.extend(remap[code] for code in theirs.codes)
+        self._indexes.clear()
+
+    def deduplicated(self):
+        """One row per uuid, keeping the most recently updated copy (rows without a uuid are kept)."""
+        best = {}
+        keep = []
+        for i, uuid in enumerate(self.uuid):
+            if not uuid:
+                keep.append(i)
+                continue
+            j = best.get(uuid)
+            if j is None or self.updated_at[i] > self.updated_at[j]:
+                best[uuid] = i
+        keep.extend(best.values())
+        keep.sort()
+        return self.take(keep)
+
+    def index(self, column='created_at'):
+        """Sorted TimeIndex on a timestamp column, built once per table."""
+        if column not in self._indexes:
+            self._indexes[column] = TimeIndex(getattr(self, column), self.duration)
+        return self._indexes[column]
+
+    def between(self, start=None, end=None, column='created_at'):
+        """Sessions whose timestamp falls in [start, end), in timestamp order."""
+        return self.take(self.index(column).positions(start, end))
+
+    def total_duration(self):
+        return math.fsum(self.duration)
+
+    def count_by(self, column):
+        """Row count per distinct value of a category column."""
+        cat = getattr(self, column)
+        counts = [0] * len(cat.values)
+        for code in cat.codes:
+            counts[code] += 1
+        # Filtered tables share the parent's value table, so skip absent values
+        return {v: n for v, n in zip(cat.values, counts) if n}
+
+    def duration_by(self, column):
+        """Total duration (seconds) per distinct value of a category column."""
+        cat = getattr(self, column)
+        sums = [0.0] * len(cat.values)
+        seen = [False] * len(cat.values)
+        for code, dur in zip(cat.codes, self.duration):
+            sums[code] += dur
+            seen[code] = True
+        return {v: s for v, s, hit in zip(cat.values, sums, seen) if hit}
+
+
+class TimeIndex:
+    """Row positions sorted by a timestamp column, answering range queries by bisection.
+
+    A prefix sum of durations in the same order makes the total for any range
+    O(log n), which keeps daily/monthly rollups cheap on large exports.
+    """
+
+    def __init__(self, timestamps, duration):
+        order = sorted((i for i, ts in enumerate(timestamps) if not math.isnan(ts)),
+                       key=timestamps.__getitem__)
+        self.order = array.array('q', order)
+        self.keys = array.array('d', [timestamps[i] for i in order])
+        self.cumulative = array.array('d', accumulate((duration[i] for i in order), initial=0.0))
+
+    def bounds(self, start=None, end=None):
+        lo = 0 if start is None else bisect.bisect_left(self.keys, start)
+        hi = len(self.keys) if end is None else bisect.bisect_left(self.keys, end)
+        return lo, max(lo, hi)
+
+    def positions(self, start=None, end=None):
+        lo, hi = self.bounds(start, end)
+        return self.order[lo:hi]
+
+    def count(self, start=None, end=None):
+        lo, hi = self.bounds(start, end)
+        return hi - lo
+
+    def duration(self, start=None, end=None):
+        lo, hi = self.bounds(start, end)
+        return self.cumulative[hi] - self.cumulative[lo]
+
+    def rollup(self, start, end, period='day', tz=datetime.timezone.utc):
+        """(bucket_start, sessions, seconds) per calendar day or month in tz."""
+        out = []
+        for lo, hi in period_buckets(start, end, period, tz):
+            out.append((lo, self.count(lo, hi), self.duration(lo, hi)))
+        return out
+
+
+# ============= DATE RANGES =============
+
+def get_timezone(name):
+    """Resolve 'UTC', a fixed offset like '+05:30', or an IANA zone name."""
+    if not name or name.upper() in ('UTC', 'Z'):
+        return datetime.timezone.utc
+    if name[0] in '+-':
+        sign = -1 if name[0] == '-' else 1
+        hours, _, minutes = name[1:].partition(':')
+        return datetime.timezone(sign * datetime.timedelta(hours=int(hours), minutes=int(minutes or 0)))
+    from zoneinfo import ZoneInfo
+    return ZoneInfo(name)
+
+
+def parse_bound(value, tz, inclusive_end=False):
+    """Parse a --from/--to value to epoch seconds.
+
+    Naive values are read in tz. A bare date used as an end bound covers that
+    whole day, so --from 2025-12-11 --to 2025-12-12 spans two days.
+    """
+    if not value:
+        return None
+    dt = datetime.datetime.fromisoformat(value)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=tz)
+    if inclusive_end and len(value) == 10:
+        dt = (dt.replace(tzinfo=None) + datetime.timedelta(days=1)).replace(tzinfo=dt.tzinfo)
+    return dt.timestamp()
+
+
+def period_buckets(start, end, period='day', tz=datetime.timezone.utc):
+    """Yield (lo, hi) epoch bounds of each calendar day/month in tz overlapping [start, end)."""
+    cur = datetime.datetime.fromtimestamp(start, tz).replace(hour=0, minute=0, second=0, microsecond=0)
+    if period == 'month':
+        cur = cur.replace(day=1)
+    while cur.timestamp() < end:
+        if period == 'month':
+            naive = cur.replace(tzinfo=None)
+            nxt = naive.replace(year=naive.year + naive.month // 12, month=naive.month % 12 + 1)
+        else:
+            nxt = cur.replace(tzinfo=None) + datetime.timedelta(days=1)
+        nxt = nxt.replace(tzinfo=tz)
+        yield max(cur.timestamp(), start), min(nxt.timestamp(), end)
+        cur = nxt
+
+
+def add_range_args(parser):
+    """--from/--to/--tz; without them a script covers the whole export."""
+    parser.add_argument('--from', dest='date_from',
+                        help='Start date/time (ISO-8601, inclusive)')
+    parser.add_argument('--to', dest='date_to',
+                        help='End date/time (ISO-8601; a bare date includes that whole day)')
+    parser.add_argument('--tz', default='UTC',
+                        help="Timezone for naive dates and rollups: 'UTC', '+05:30' or an IANA name")
+
+
+def resolve_range(args):
+    """(start, end, tz) from parsed add_range_args arguments."""
+    tz = get_timezone(args.tz)
+    return parse_bound(args.date_from, tz), parse_bound(args.date_to, tz, inclusive_end=True), tz
+
+
+# ============= LOADING =============
+
+def _detect_encoding(file_path):
+    with open(file_path, 'rb') as f:
+        bom = f.read(2)
+    if bom in (b'\xff\xfe', b'\xfe\xff'):
+        return 'utf-16'
+    return 'utf-8-sig'
+
+
+def iter_csv_rows(file_path):
+    """Yield rows of a CSV export; UTF-16 (as written by dump_csv.py) or UTF-8.
+
+    Older UTF-16 dumps dropped the always-empty context_override and
+    webhook_url cells, leaving rows exactly two fields shorter than the
+    header. Blanks are put back at those two columns so every field lines up
+    with its header again (mid-row if the header does not name them).
+    """
+    with open(file_path, 'r', encoding=_detect_encoding(file_path), newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        yield header
+        width = len(header)
+        gaps = sorted(find_column(header, name) for name in LEGACY_DROPPED_COLUMNS)
+        if gaps[0] < 0:
+            gaps = [width // 2, width // 2 + 1]
+        for row in reader:
+            if len(row) == width - 2 and width > 2:
+                for gap in gaps:
+                    row.insert(gap, "")
+            yield row
+
+
+def iter_export_rows(file_path, sheet=None):
+    """Yield the header and then each row of an xlsx, csv or .tvcol row export (dump_csv.py)."""
+    if file_path.lower().endswith('.csv'):
+        return iter_csv_rows(file_path)
+    if file_path.lower().endswith('.tvcol'):
+        return colstore.iter_rows(file_path)
+    if sheet:
+        return iter_rows(file_path, sheet)
+    return iter_rows(file_path)
+
+
+def find_column(header, name):
+    """Index of a header column: exact name first, then a prefix match ("Duration (s)", "created")."""
+    lowered = [str(h).strip().lower() for h in header]
+    if name in lowered:
+        return lowered.index(name)
+    key = name.split('_')[0]
+    for i, h in enumerate(lowered):
+        if h.startswith(key):
+            return i
+    return -1
+
+
+def _cell(row, idx):
+    # Rows may stop short of the header: xlsx omits trailing empty cells
+    return row[idx] if 0 <= idx < len(row) else ""
+
+
+def build_table(rows, table=None):
+    """Fill a SessionTable from an iterator yielding the header and then data rows."""
+    table = table if table is not None else SessionTable()
+    header = next(rows, None)
+    if header is None:
+        return table
+    idx = {name: find_column(header, name) for name in
+           ('uuid', 'created_at', 'updated_at', 'duration') + CATEGORY_COLUMNS}
+    start = len(table)
+    present = dict.fromkeys(TIMESTAMP_COLUMNS, 0)
+    for r in rows:
+        if not any(r):
+            continue
+        for name in TIMESTAMP_COLUMNS:
+            if _cell(r, idx[name]):
+                present[name] += 1
+        table.append(
+            _cell(r, idx['uuid']),
+            parse_timestamp(_cell(r, idx['created_at'])),
+            parse_timestamp(_cell(r, idx['updated_at'])),
+            parse_float(_cell(r, idx['duration'])),
+            _cell(r, idx['status']),
+            _cell(r, idx['replica_uuid']),
+            _cell(r, idx['persona_uuid']),
+        )
+    for name in TIMESTAMP_COLUMNS:
+        col = getattr(table, name)
+        if present[name] and all(math.isnan(col[i]) for i in range(start, len(table))):
+            print(f"Warning: {present[name]} non-empty {name} values but none parsed as a timestamp",
+                  file=sys.stderr)
+    return table
+
+
+def load_sessions(file_path, sheet=None):
+    """Load an xlsx, csv or .tvcol conversation export, or a saved SessionTable, into a SessionTable."""
+    if is_session_table(file_path):
+        return load_table(file_path)
+    return build_table(iter_export_rows(file_path, sheet))
+
+
+def print_summary(table):
+    total = table.total_duration()
+    print(f"Sessions: {len(table)}")
+    print(f"Total Duration: {total:.1f} seconds ({total/60:.1f} minutes)")
+    for column in CATEGORY_COLUMNS:
+        counts = table.count_by(column)
+        durations = table.duration_by(column)
+        print(f"\n--- BY {column.upper()} ---")
+        for value in sorted(durations, key=durations.get, reverse=True):
+            print(f"{value or '?':<40} | {counts[value]:>6} | {durations[value]/60:>10.1f} min")
+
+
+# ============= SESSION TABLE FILES =============
+# A SessionTable saved as colstore (ingest.py --out, the session cache). It
+# shares the .tvcol extension with dump_csv.py's row exports; the block
+# metadata tells them apart, as only row exports carry a 'header'.
+
+def is_session_table(file_path):
+    return file_path.lower().endswith('.tvcol') and 'header' not in colstore.read_meta(file_path)
+
+
+def table_to_columns(table):
+    columns = [('uuid', 'str', table.uuid),
+               ('created_at', 'd', table.created_at),
+               ('updated_at', 'd', table.updated_at),
+               ('duration', 'd', table.duration)]
+    for name in CATEGORY_COLUMNS:
+        cat = getattr(table, name)
+        columns.append((name, 'cat', (cat.values, cat.codes)))
+    return columns
+
+
+def table_from_columns(cols):
+    table = SessionTable()
+    table.uuid = cols['uuid']
+    table.created_at = cols['created_at']
+    table.updated_at = cols['updated_at']
+    table.duration = cols['duration']
+    for name in CATEGORY_COLUMNS:
+        values, codes = cols[name]
+        setattr(table, name, Category(values, codes))
+    return table
+
+
+def save_table(path, table, meta=None):
+    """Write a SessionTable atomically as a colstore file."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    colstore.write_file(tmp, table_to_columns(table), len(table), meta)
+    os.replace(tmp, path)
+
+
+def load_table(path):
+    _, _, cols = colstore.read_file(path)
+    return table_from_columns(cols)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python session_table.py <export.xlsx|export.csv>")
+    else:
+        print_summary(load_sessions(sys.argv[1]))
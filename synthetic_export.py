@@ -0,0 +1,169 @@
+import csv
+import random
+import argparse
+import zipfile
+import datetime
+from xml.sax.saxutils import escape
+
+HEADER = ['id', 'uuid', 'name', 'status', 'replica_uuid', 'persona_uuid', 'context_override', 'url',
+          'owner_id', 'webhook_url', 'is_deleted', 'created_at', 'updated_at', 'duration']
+STATUSES = ['ended', 'ended', 'ended', 'ended', 'active', 'error']
+NAMES = ['Morgan Demo Session', 'New Conversation', 'Sales Discovery Call']
+REPLICAS = [f"r{n:011x}" for n in range(0xa11ce, 0xa11ce + 12)]
+PERSONAS = [f"p{n:011x}" for n in range(0xbeef0, 0xbeef0 + 20)]
+START = datetime.datetime(2025, 11, 1, tzinfo=datetime.timezone.utc).timestamp()
+OWNER_ID = '117505.0'
+
+NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+
+
+def iter_sessions(rows, seed=0):
+    """Yield synthetic export rows (all 14 columns as strings), ordered by created_at."""
+    rnd = random.Random(seed)
+    t = START
+    for i in range(rows):
+        t += rnd.expovariate(1 / 45.0)
+        duration = round(min(rnd.lognormvariate(5.5, 1.2), 4 * 3600))
+        uuid = f"c{rnd.getrandbits(60):015x}"
+        yield [f"{3000000 + i}.0", uuid, rnd.choice(NAMES), rnd.choice(STATUSES),
+               rnd.choice(REPLICAS), rnd.choice(PERSONAS), "", f"https://tavus.daily.co/{uuid}",
+               OWNER_ID, "", rnd.choice('01'), _iso(t), _iso(t + duration), f"{duration}.0"]
+
+
+def _iso(ts):
+    return datetime.datetime.fromtimestamp(ts, datetime.timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'
+
+
+def _col(i):
+    s = ''
+    i += 1
+    while i:
+        i, rem = divmod(i - 1, 26)
+        s = chr(65 + rem) + s
+    return s
+
+
+# Columns written as numbers; everything else goes through the shared-string table
+NUMERIC = {0, 8, 10, 13}
+COLS = [_col(i) for i in range(len(HEADER))]
+
+
+def write_csv(path, rows, seed=0, encoding='utf-16'):
+    """CSV in the same shape as dump_csv.py output (UTF-16, every field quoted)."""
+    with open(path, 'w', encoding=encoding, newline='', buffering=1 << 20) as f:
+        writer = csv.writer(f, quoting=csv.QUOTE_ALL)
+        writer.writerow(HEADER)
+        writer.writerows(iter_sessions(rows, seed))
+
+
+def write_xlsx(path, rows, seed=0):
+    """Minimal xlsx with shared strings and sparse empty cells, streamed in constant memory.
+
+    The small fixed vocabulary takes the first shared-string slots; per-row
+    unique strings (uuid, url) get slots base + 2*i and are regenerated from the
+    same seed when sharedStrings.xml is written, so they are never held in memory.
+    """
+    fixed_order = list(dict.fromkeys(HEADER + STATUSES + NAMES + REPLICAS + PERSONAS))
+    fixed = {value: i for i, value in enumerate(fixed_order)}
+    base = len(fixed_order)
+
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as z:
+        with z.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as raw:
+            out = _Buffered(raw)
+            out.write(f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<worksheet xmlns="{NS}"><sheetData>')
+            out.write(_row(1, [(c, 's', fixed[h]) for c, h in zip(COLS, HEADER)]))
+            for i, r in enumerate(iter_sessions(rows, seed)):
+                cells = []
+                for ci, value in enumerate(r):
+                    if value == "":
+                        continue
+                    if ci in NUMERIC:
+                        cells.append((COLS[ci], None, value))
+                    elif ci in (1, 7):
+                        cells.append((COLS[ci], 's', base + 2 * i + (ci == 7)))
+                    elif ci in (11, 12):
+                        cells.append((COLS[ci], 'str', value))
+                    else:
+                        cells.append((COLS[ci], 's', fixed[value]))
+                out.write(_row(i + 2, cells))
+            out.write('</sheetData></worksheet>')
+            out.flush()
+
+        with z.open('xl/sharedStrings.xml', 'w', force_zip64=True) as raw:
+            out = _Buffered(raw)
+            out.write(f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<sst xmlns="{NS}">')
+            for value in fixed_order:
+                out.write(f'<si><t>{escape(value)}</t></si>')
+            for r in iter_sessions(rows, seed):
+                out.write(f'<si><t>{r[1]}</t></si><si><t>{escape(r[7])}</t></si>')
+            out.write('</sst>')
+            out.flush()
+
+        z.writestr('[Content_Types].xml',
+                   '<?xml version="1.0" encoding="UTF-8"?><Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                   '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+                   '<Default Extension="xml" ContentType="application/xml"/>'
+                   '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+                   '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+                   '<Override PartName="/xl/sharedStrings.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+                   '</Types>')
+        z.writestr('_rels/.rels',
+                   '<?xml version="1.0" encoding="UTF-8"?><Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+                   '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+                   '</Relationships>')
+        z.writestr('xl/workbook.xml',
+                   f'<?xml version="1.0" encoding="UTF-8"?><workbook xmlns="{NS}" xmlns:r="{REL_NS}">'
+                   '<sheets><sheet name="Conversations" sheetId="1" r:id="rId1"/></sheets></workbook>')
+        z.writestr('xl/_rels/workbook.xml.rels',
+                   '<?xml version="1.0" encoding="UTF-8"?><Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+                   f'<Relationship Id="rId1" Type="{REL_NS}/worksheet" Target="worksheets/sheet1.xml"/>'
+                   f'<Relationship Id="rId2" Type="{REL_NS}/sharedStrings" Target="sharedStrings.xml"/>'
+                   '</Relationships>')
+
+
+def _row(n, cells):
+    parts = [f'<row r="{n}">']
+    for col, kind, value in cells:
+        if kind == 's':
+            parts.append(f'<c r="{col}{n}" t="s"><v>{value}</v></c>')
+        elif kind == 'str':
+            parts.append(f'<c r="{col}{n}" t="str"><v>{value}</v></c>')
+        else:
+            parts.append(f'<c r="{col}{n}"><v>{value}</v></c>')
+    parts.append('</row>')
+    return ''.join(parts)
+
+
+class _Buffered:
+    """Collect small string writes and hand the zip stream large UTF-8 chunks."""
+
+    def __init__(self, raw, limit=1 << 20):
+        self.raw = raw
+        self.limit = limit
+        self.parts = []
+        self.size = 0
+
+    def write(self, s):
+        self.parts.append(s)
+        self.size += len(s)
+        if self.size >= self.limit:
+            self.flush()
+
+    def flush(self):
+        self.raw.write(''.join(self.parts).encode('utf-8'))
+        self.parts = []
+        self.size = 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a synthetic Tavus conversation export.")
+    parser.add_argument("out", help="Output .xlsx or .csv path")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if args.out.lower().endswith('.csv'):
+        write_csv(args.out, args.rows, args.seed)
+    else:
+        write_xlsx(args.out, args.rows, args.seed)
+    print(f"Wrote {args.rows} rows to {args.out}")
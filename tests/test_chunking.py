@@ -0,0 +1,25 @@
+import json
+
+from chunking import chunk_text, estimate_tokens
+
+
+def test_minified_json_chunks_fit_the_budget():
+    # One long line, almost every character its own token
+    text = json.dumps([{"a": [1, 2, {"b": None}], "c": "d"} for _ in range(1500)], separators=(',', ':'))
+    assert "\n" not in text and estimate_tokens(text) > 6000
+
+    chunks = chunk_text(text, 6000)
+
+    assert len(chunks) > 1
+    assert all(estimate_tokens(chunk) <= 6000 for chunk in chunks)
+    assert "".join(chunks) == text
+
+
+def test_sections_stay_whole():
+    text = "".join(f"# Section {n}\n\n" + "word " * 200 + "\n" for n in range(10))
+
+    chunks = chunk_text(text, 500)
+
+    assert "".join(chunks) == text
+    assert all(chunk.startswith("# Section") for chunk in chunks)
+    assert all(estimate_tokens(chunk) <= 500 for chunk in chunks)
@@ -0,0 +1,16 @@
+import dump_csv
+import session_table
+from test_session_table import HEADER, write_sheet
+
+
+def test_dump_csv_pads_short_rows(tmp_path):
+    active = ['1', 'u-active', 'Demo', 'active', 'r1', 'p1', '', 'https://x', '7', '', '0',
+              '2025-12-11T10:00:00Z', '', '']
+    xlsx, out = tmp_path / 'export.xlsx', tmp_path / 'dump.csv'
+    write_sheet(xlsx, [HEADER, active])
+
+    dump_csv.dump_csv(str(xlsx), str(out))
+
+    rows = list(session_table.iter_csv_rows(str(out)))
+    assert [len(r) for r in rows] == [len(HEADER), len(HEADER)]
+    assert rows[1] == active
@@ -0,0 +1,21 @@
+from run_journal import RunJournal
+
+RUN = {"model": "m"}
+
+
+def test_resume_after_torn_line_keeps_new_records(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = RunJournal(str(path))
+    journal.open(RUN)
+    journal.append("file", file="x")
+    journal.close()
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"type": "file", "fi')   # crash mid-write
+
+    journal = RunJournal(str(path))
+    assert [r["file"] for r in journal.open(RUN, resume=True)] == ["x"]
+    journal.append("file", file="z")
+    journal.close()
+
+    _, records = RunJournal(str(path)).read()
+    assert [r["file"] for r in records] == ["x", "z"]
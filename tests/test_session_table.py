@@ -0,0 +1,102 @@
+import math
+import zipfile
+
+import session_table
+
+HEADER = ['id', 'uuid', 'name', 'status', 'replica_uuid', 'persona_uuid', 'context_override', 'url',
+          'owner_id', 'webhook_url', 'is_deleted', 'created_at', 'updated_at', 'duration']
+NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+
+
+def _col(i):
+    return chr(ord('A') + i)
+
+
+def write_sheet(path, rows):
+    """Minimal xlsx with inline strings; empty cells are left out, as Excel does."""
+    xml = [f'<worksheet xmlns="{NS}"><sheetData>']
+    for n, row in enumerate(rows, 1):
+        cells = "".join(f'<c r="{_col(i)}{n}" t="inlineStr"><is><t>{v}</t></is></c>'
+                        for i, v in enumerate(row) if v != "")
+        xml.append(f'<row r="{n}">{cells}</row>')
+    xml.append('</sheetData></worksheet>')
+    with zipfile.ZipFile(path, 'w') as z:
+        z.writestr('xl/worksheets/sheet1.xml', "".join(xml))
+
+
+def test_xlsx_row_without_trailing_cells(tmp_path):
+    # An active session has no updated_at or duration yet; xlsx stops the row at created_at
+    active = ['1', 'u-active', 'Demo', 'active', 'r1', 'p1', '', 'https://x', '7', '', '0',
+              '2025-12-11T10:00:00Z', '', '']
+    ended = ['2', 'u-ended', 'Demo', 'ended', 'r2', 'p2', '', 'https://y', '7', '', '0',
+             '2025-12-11T09:00:00Z', '2025-12-11T09:01:00Z', '60']
+    path = tmp_path / 'export.xlsx'
+    write_sheet(path, [HEADER, active, ended])
+
+    table = session_table.load_sessions(str(path))
+
+    assert table.row(0)['uuid'] == 'u-active'
+    assert table.row(0)['status'] == 'active'
+    assert table.row(0)['replica_uuid'] == 'r1'
+    assert table.row(0)['persona_uuid'] == 'p1'
+    assert table.row(0)['created_at'] == session_table.parse_timestamp('2025-12-11T10:00:00+00:00')
+    assert math.isnan(table.row(0)['updated_at'])
+    assert table.row(0)['duration'] == 0.0
+    assert table.row(1)['duration'] == 60.0
+
+
+def test_legacy_csv_rows_two_short(tmp_path):
+    # Older UTF-16 dumps dropped context_override and webhook_url from every row
+    row = ['2978864.0', 'c8b3866117f4b43f', 'Morgan Demo Session', 'ended', 'rc2146c13e81', 'p518a2f6eba9',
+           'https://tavus.daily.co/c8b3866117f4b43f', '117505.0', '1',
+           '2025-12-12T15:22:52.814Z', '2025-12-12T15:24:42.458Z', '110.0']
+    path = tmp_path / 'dump.csv'
+    path.write_text("\n".join(",".join(f'"{v}"' for v in r) for r in [HEADER, row]) + "\n", encoding='utf-16')
+
+    table = session_table.load_sessions(str(path))
+
+    assert table.row(0)['uuid'] == 'c8b3866117f4b43f'
+    assert table.row(0)['status'] == 'ended'
+    assert table.row(0)['persona_uuid'] == 'p518a2f6eba9'
+    assert table.row(0)['created_at'] == 1765552972.814
+    assert table.row(0)['updated_at'] == 1765553082.458
+    assert table.row(0)['duration'] == 110.0
+
+    # The blanks go back where the dropped columns were, not just mid-row
+    fields = dict(zip(HEADER, list(session_table.iter_csv_rows(str(path)))[1]))
+    assert fields['context_override'] == '' and fields['webhook_url'] == ''
+    assert fields['url'] == 'https://tavus.daily.co/c8b3866117f4b43f'
+    assert fields['owner_id'] == '117505.0'
+    assert fields['is_deleted'] == '1'
+
+
+def test_parse_timestamp_z_suffix():
+    assert session_table.parse_timestamp('2025-12-12T15:22:52Z') == 1765552972.0
+    assert session_table.parse_timestamp('2025-12-12T15:22:52z') == 1765552972.0
+    assert math.isnan(session_table.parse_timestamp('not a date'))
+
+
+def test_warns_when_timestamps_never_parse(tmp_path, capsys):
+    path = tmp_path / 'bad.csv'
+    path.write_text("uuid,created_at,duration\nu1,12/11/2025 10:00,5\n", encoding='utf-8')
+
+    session_table.load_sessions(str(path))
+
+    assert 'created_at' in capsys.readouterr().err
+
+
+def test_tvcol_row_export_and_saved_table(tmp_path):
+    import dump_csv
+    import session_cache
+
+    row = ['1', 'u1', 'Demo', 'ended', 'r1', 'p1', '', 'https://x', '7', '', '0',
+           '2025-12-11T09:00:00Z', '2025-12-11T09:01:00Z', '60']
+    xlsx, rows_path, table_path = tmp_path / 'e.xlsx', str(tmp_path / 'rows.tvcol'), str(tmp_path / 'merged.tvcol')
+    write_sheet(xlsx, [HEADER, row])
+    dump_csv.dump_columnar(str(xlsx), rows_path)
+    session_table.save_table(table_path, session_table.load_sessions(rows_path))
+
+    for path in (rows_path, table_path):
+        assert session_table.load_sessions(path).row(0)['duration'] == 60.0
+        table = session_cache.load_sessions(path, cache_dir=str(tmp_path / 'cache'))
+        assert table.row(0)['uuid'] == 'u1'
@@ -0,0 +1,38 @@
+import math
+import datetime
+
+import usage_ledger
+from session_table import SessionTable
+
+UTC = datetime.timezone.utc
+DAY = 86400.0
+
+
+def sessions(*rows):
+    table = SessionTable()
+    for uuid, updated_at, duration in rows:
+        table.append(uuid, updated_at - duration, updated_at, duration, 'ended', 'r1', 'p1')
+    return table
+
+
+def test_update_picks_up_rows_behind_the_mark():
+    conn = usage_ledger.connect(':memory:')
+    assert usage_ledger.update(conn, sessions(('a', 10 * DAY, 60)), UTC) == (1, 0, 0)
+
+    # Another workspace's export lags behind the first one's high-water mark
+    other = sessions(('a', 10 * DAY, 60), ('b', 5 * DAY, 30), ('c', math.nan, 15))
+    assert usage_ledger.update(conn, other, UTC) == (2, 0, 0)
+
+    totals = conn.execute("SELECT SUM(sessions), SUM(seconds) FROM by_status").fetchone()
+    assert tuple(totals) == (3, 105)
+
+
+def test_update_replaces_untimed_copy_and_reports_untimed_rows():
+    conn = usage_ledger.connect(':memory:')
+    usage_ledger.update(conn, sessions(('a', math.nan, 15)), UTC)
+
+    assert usage_ledger.update(conn, sessions(('a', 3 * DAY, 40)), UTC) == (0, 1, 0)
+    assert usage_ledger.update(conn, sessions(('a', math.nan, 99)), UTC) == (0, 0, 1)
+
+    row = conn.execute("SELECT sessions, seconds FROM by_status WHERE status = 'ended'").fetchone()
+    assert tuple(row) == (1, 40)
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Nova Analysis Cache
+===================
+Persistent cache of LLM results for the Nova tools. Each entry is one small
+JSON file named by a content hash of everything that shaped the result
+(file content, prompt template, model, options), so a hit can be reused
+verbatim and any change to an input simply misses.
+
+Author: Alpha (Antigravity)
+Date: December 2025
+"""
+
+import os
+import json
+import hashlib
+
+
+def cache_key(*parts):
+    """Stable sha256 over any JSON-serializable inputs."""
+    blob = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def is_error(text):
+    """True for the placeholder strings the tools write when a call fails."""
+    return text.startswith("[ERROR") or text.startswith("[OLLAMA ERROR") or text == "[NO RESPONSE]"
+
+
+class AnalysisCache:
+    """Directory of <key>.json entries. Safe to use from several threads."""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key):
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key, entry):
+        # Write-then-rename so a crash never leaves a half-written entry
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.{id(entry)}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def keys(self):
+        return {name[:-5] for name in os.listdir(self.cache_dir) if name.endswith(".json")}
+
+    def prune(self, keep):
+        """Delete every entry whose key is not in keep. Returns how many were removed."""
+        removed = 0
+        for key in self.keys() - set(keep):
+            try:
+                os.remove(self._path(key))
+                removed += 1
+            except OSError:
+                pass
+        return removed
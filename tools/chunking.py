@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Nova Chunking
+=============
+Splits long corpus files into pieces that fit the model's context window,
+so large files (system prompts, KB dumps) are analyzed in full instead of
+being cut off at a fixed character count.
+
+Splits prefer structural boundaries: Markdown headings and rules first,
+then top-level code definitions, then blank lines, then single lines. Only
+a single line longer than the whole budget is ever cut mid-text. Adjacent
+sections are packed greedily, so a chunk holds as many whole sections as
+the token budget allows and an unchanged section keeps producing the same
+chunk text from run to run.
+
+No tokenizer ships with the tools, so token counts are a conservative
+estimate (roughly one token per word or punctuation mark, and never fewer
+than one per four characters).
+
+Author: Alpha (Antigravity)
+Date: December 2025
+"""
+
+import re
+
+# ============= CONFIGURATION =============
+CHARS_PER_TOKEN = 4    # lower bound used for long unbroken runs (base64, minified code)
+PROMPT_HEADROOM = 256  # tokens left free for file names and estimate error
+
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+# Lines that start a new section, strongest first
+HEADING = re.compile(r"^(#{1,6}\s|={3,}\s*$|-{3,}\s*$|\*{3,}\s*$)")
+DEFINITION = re.compile(r"^(def |class |async def |function |export |const \w+ = \(|interface |type \w+ =)")
+
+
+def estimate_tokens(text):
+    """Conservative token estimate for budgeting prompts."""
+    return max(len(TOKEN_PATTERN.findall(text)), len(text) // CHARS_PER_TOKEN)
+
+
+def prompt_budget(template, options):
+    """Tokens of input that fit in options' context window alongside a template and its reply."""
+    return options["num_ctx"] - options["num_predict"] - estimate_tokens(template) - PROMPT_HEADROOM
+
+
+def _split_at(lines, is_boundary):
+    """Group lines into sections, starting a new one at every boundary line."""
+    sections, current = [], []
+    for line in lines:
+        if current and is_boundary(line):
+            sections.append(current)
+            current = []
+        current.append(line)
+    if current:
+        sections.append(current)
+    return ["".join(s) for s in sections]
+
+
+SPLITTERS = [
+    lambda line: bool(HEADING.match(line)),
+    lambda line: bool(DEFINITION.match(line)),
+    lambda line: not line.strip(),
+]
+
+
+def split_sections(text, max_tokens, level=0):
+    """Split text into pieces of at most max_tokens, using the coarsest boundaries that work."""
+    if estimate_tokens(text) <= max_tokens:
+        return [text]
+    lines = text.splitlines(keepends=True)
+    if level < len(SPLITTERS):
+        sections = _split_at(lines, SPLITTERS[level])
+        if len(sections) == 1:
+            return split_sections(text, max_tokens, level + 1)
+    elif len(lines) > 1:
+        sections = lines
+    else:
+        # One enormous line: cut it by characters as a last resort. Dense
+        # punctuation (minified JSON) can count a token per character, so
+        # halve the cut until it fits; max_tokens characters always do.
+        pieces, i = [], 0
+        while i < len(text):
+            step = max_tokens * CHARS_PER_TOKEN
+            while step > max_tokens and estimate_tokens(text[i:i + step]) > max_tokens:
+                step = max(max_tokens, step // 2)
+            pieces.append(text[i:i + step])
+            i += step
+        return pieces
+
+    pieces = []
+    for section in sections:
+        pieces.extend(split_sections(section, max_tokens, level + 1))
+    return pieces
+
+
+def chunk_text(text, max_tokens):
+    """Pack structural sections greedily into chunks of at most max_tokens."""
+    chunks, current, current_tokens = [], [], 0
+    for piece in split_sections(text, max_tokens):
+        tokens = estimate_tokens(piece)
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append("".join(current))
+            current, current_tokens = [], 0
+        current.append(piece)
+        current_tokens += tokens
+    if current:
+        chunks.append("".join(current))
+    return chunks
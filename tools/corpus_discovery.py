@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Nova Corpus Discovery
+=====================
+Finds the files to analyze. Directories are scanned concurrently (one
+os.scandir per task, so slow network shares don't serialize the walk), and
+the walk can be cancelled with Ctrl+C at any point.
+
+Which files count is decided by gitignore-style rules:
+    - include patterns select files ("*.md", "prompts/**/*.txt")
+    - exclude patterns, plus a .novaignore file in the corpus root, remove
+      them again; "!pattern" re-includes, the last matching rule wins
+    - "dir/" matches directories only; a pattern containing "/" is anchored
+      to the corpus root, otherwise it matches at any depth
+    - excluded directories are never entered
+
+Author: Alpha (Antigravity)
+Date: December 2025
+"""
+
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# ============= CONFIGURATION =============
+DEFAULT_INCLUDE = ["*.txt", "*.md", "*.json", "*.py", "*.ts", "*.tsx", "*.js", "*.jsx"]
+DEFAULT_EXCLUDE = [".*/", "node_modules/", "__pycache__/"]
+IGNORE_FILE = ".novaignore"
+SCAN_WORKERS = 8
+
+
+def _translate(pattern):
+    """Regex source for a gitignore glob (without anchoring or the trailing '/')."""
+    rx, i = "", 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            rx += "(?:.*/)?"
+            i += 3
+        elif pattern.startswith("**", i):
+            rx += ".*"
+            i += 2
+        elif pattern[i] == "*":
+            rx += "[^/]*"
+            i += 1
+        elif pattern[i] == "?":
+            rx += "[^/]"
+            i += 1
+        elif pattern[i] == "[" and "]" in pattern[i + 2:]:
+            end = pattern.index("]", i + 2)
+            body = pattern[i + 1:end]
+            rx += "[" + ("^" + body[1:] if body.startswith("!") else body) + "]"
+            i = end + 1
+        else:
+            rx += re.escape(pattern[i])
+            i += 1
+    return rx
+
+
+class Rule:
+    def __init__(self, pattern, ignore_case=False):
+        self.negate = pattern.startswith("!")
+        pattern = pattern[1:] if self.negate else pattern
+        self.dir_only = pattern.endswith("/")
+        pattern = pattern.rstrip("/")
+        anchored = "/" in pattern
+        prefix = "" if anchored else "(?:.*/)?"
+        self.regex = re.compile(prefix + _translate(pattern.lstrip("/")) + "$",
+                                re.IGNORECASE if ignore_case else 0)
+
+    def matches(self, relpath, is_dir):
+        return (is_dir or not self.dir_only) and self.regex.match(relpath) is not None
+
+
+class Rules:
+    """Ordered gitignore-style rules; the last rule that matches a path decides."""
+
+    def __init__(self, patterns, ignore_case=False):
+        self.rules = [Rule(p, ignore_case) for p in patterns]
+
+    def matched(self, relpath, is_dir=False):
+        result = False
+        for rule in self.rules:
+            if rule.matches(relpath, is_dir):
+                result = not rule.negate
+        return result
+
+
+def read_ignore_file(path):
+    """Patterns from a .gitignore-style file (blank lines and # comments skipped)."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    except OSError:
+        return []
+
+
+def discover(root, include=None, exclude=None, skip=(), workers=SCAN_WORKERS, cancel=None):
+    """[(path, size)] of every file under root that passes the rules, sorted by path.
+
+    skip lists directories never to enter (e.g. the analyzer's output dir
+    when it lives inside the corpus). Setting the cancel event, or Ctrl+C,
+    stops the walk; KeyboardInterrupt is re-raised once workers have stopped.
+    """
+    includes = Rules(DEFAULT_INCLUDE if include is None else include, ignore_case=True)
+    excludes = Rules((DEFAULT_EXCLUDE if exclude is None else exclude) + read_ignore_file(os.path.join(root, IGNORE_FILE)))
+    skip = {os.path.normcase(os.path.abspath(p)) for p in skip}
+    cancel = cancel or threading.Event()
+
+    def scan(dirpath, rel):
+        subdirs, files = [], []
+        if cancel.is_set():
+            return subdirs, files
+        try:
+            with os.scandir(dirpath) as entries:
+                for entry in entries:
+                    relpath = rel + entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        if (os.path.normcase(os.path.abspath(entry.path)) not in skip
+                                and not excludes.matched(relpath, is_dir=True)):
+                            subdirs.append((entry.path, relpath + "/"))
+                    elif entry.is_file() and includes.matched(relpath) and not excludes.matched(relpath):
+                        files.append((entry.path, entry.stat().st_size))
+        except OSError as e:
+            print(f"⚠️  Skipping {dirpath}: {e}")
+        return subdirs, files
+
+    found = []
+    pool = ThreadPoolExecutor(max_workers=workers)
+    try:
+        pending = {pool.submit(scan, root, "")}
+        while pending:
+            # Short timeout keeps the main thread responsive to Ctrl+C
+            done, pending = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+            for future in done:
+                subdirs, files = future.result()
+                found.extend(files)
+                pending.update(pool.submit(scan, *d) for d in subdirs)
+            if cancel.is_set():
+                break
+    except KeyboardInterrupt:
+        cancel.set()
+        raise
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+    return sorted(found)
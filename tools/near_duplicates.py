@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Nova Near-Duplicate Detection
+=============================
+Finds corpus files that are copies or near-copies of each other
+("Emery_T3_v1.1 (1).txt" next to "Emery_T3_v1.1.txt", successive versions of
+the same prompt), so only one of each group has to go through the model.
+
+Each file is reduced to a set of word 5-gram shingles and a MinHash
+signature. Locality-sensitive hashing over signature bands proposes
+candidate pairs without comparing every file to every other; candidates are
+then confirmed with the exact Jaccard similarity of their shingle sets.
+
+Author: Alpha (Antigravity)
+Date: December 2025
+"""
+
+import re
+import random
+import difflib
+
+# ============= CONFIGURATION =============
+SHINGLE_WORDS = 5
+NUM_PERM = 64          # MinHash signature length
+BANDS = 16             # LSH bands of NUM_PERM // BANDS rows each
+MERSENNE_PRIME = (1 << 61) - 1
+
+_rng = random.Random(0)
+PERMUTATIONS = [(_rng.randrange(1, MERSENNE_PRIME), _rng.randrange(MERSENNE_PRIME)) for _ in range(NUM_PERM)]
+
+
+def shingles(text, k=SHINGLE_WORDS):
+    """Set of hashed k-word windows (hash() is only compared within one run)."""
+    words = re.findall(r"\w+", text.lower())
+    if len(words) <= k:
+        return {hash(" ".join(words))}
+    return {hash(" ".join(words[i:i + k])) for i in range(len(words) - k + 1)}
+
+
+def minhash(shingle_set):
+    values = [s & MERSENNE_PRIME for s in shingle_set]
+    return [min((a * x + b) % MERSENNE_PRIME for x in values) for a, b in PERMUTATIONS]
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def near_duplicate_groups(texts, threshold=0.9):
+    """Groups (lists of indices, two or more each) of texts at least `threshold` similar.
+
+    Similarity is transitive within a group: if A~B and B~C, all three share one.
+    """
+    sets = [shingles(t) for t in texts]
+    rows = NUM_PERM // BANDS
+    buckets = {}
+    for i, s in enumerate(sets):
+        signature = minhash(s)
+        for band in range(BANDS):
+            key = (band, tuple(signature[band * rows:(band + 1) * rows]))
+            buckets.setdefault(key, []).append(i)
+
+    parent = list(range(len(texts)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    checked = set()
+    for members in buckets.values():
+        for n, i in enumerate(members):
+            for j in members[n + 1:]:
+                if (i, j) in checked or find(i) == find(j):
+                    continue
+                checked.add((i, j))
+                if jaccard(sets[i], sets[j]) >= threshold:
+                    parent[find(j)] = find(i)
+
+    groups = {}
+    for i in range(len(texts)):
+        groups.setdefault(find(i), []).append(i)
+    return [g for g in groups.values() if len(g) > 1]
+
+
+def diff_summary(original, copy, max_lines=40):
+    """Short unified diff of copy against original, for a note in place of a full analysis."""
+    diff = list(difflib.unified_diff(original.splitlines(), copy.splitlines(), lineterm="", n=0))[2:]
+    changed = [line for line in diff if not line.startswith("@@")]
+    if not changed:
+        return "Identical content."
+    shown = "\n".join(changed[:max_lines])
+    more = f"\n... {len(changed) - max_lines} more changed lines" if len(changed) > max_lines else ""
+    return f"{len(changed)} changed lines:\n```diff\n{shown}{more}\n```"
@@ -7,6 +7,35 @@ strategic report — the "30,000 foot view" of everything.
 
 Usage:
     python nova_meta_synthesizer.py
+    python nova_meta_synthesizer.py --resume    # reuse batches finished by an interrupted run
+    python nova_meta_synthesizer.py --no-stream # wait for whole replies instead of streaming
+    python nova_meta_synthesizer.py --parallel 4
+    python nova_meta_synthesizer.py --no-cache  # re-synthesize every batch
+    python nova_meta_synthesizer.py --semantic  # batch related analyses together (needs EMBED_MODEL)
+    python nova_meta_synthesizer.py --hosts http://localhost:11434,http://workstation2:11434
+
+Analyses are synthesized as a tree: batches of analyses are summarized, then
+batches of those summaries, level by level, until everything fits one final
+prompt. Batches are sized by token budget (not a fixed count), and each
+level's batches run concurrently, so cost grows logarithmically with the corpus.
+
+Batch syntheses are cached in ANALYSIS_DIR/.synthesis_cache by a hash of their
+exact prompt, and batch boundaries are chosen by file name rather than
+position, so after a small corpus change only the affected batches (and the
+levels above them) are re-synthesized.
+
+With --semantic, each analysis is embedded through Ollama (vectors cached in
+ANALYSIS_DIR/.embedding_cache) and the first level's batches are built from
+topic clusters, so related files are synthesized together.
+
+Batches are spread over every Ollama server in OLLAMA_HOSTS (or --hosts),
+each going to the least busy healthy server that has the model pulled.
+
+The final synthesis is streamed to the console and to OUTPUT_FILE.partial as it
+is written; each call's TTFT and tokens/sec are printed and added to the footer.
+Every batch call (latency, queue wait, tokens, bytes, cache hits, retries) is
+recorded in ANALYSIS_DIR/synthesis_metrics.json, with p50/p95/p99 tables,
+latency histograms and the slowest batches in synthesis_metrics.md.
 
 Prerequisites:
     - Run nova_overnight_analyzer.py first (Phase 1)
@@ -17,20 +46,51 @@ Date: December 2025
 """
 
 import os
+import sys
 import time
-import requests
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 
+from analysis_cache import AnalysisCache, cache_key, is_error
+from chunking import estimate_tokens, prompt_budget
+from clustering import topic_groups
+from ollama_client import format_metrics, summarize_metrics, timed_out
+from ollama_router import OLLAMA_HOSTS, OllamaRouter
+from run_journal import RunJournal
+from run_metrics import RunMetrics
+
 # ============= CONFIGURATION =============
 ANALYSIS_DIR = r"C:\AI Fusion Labs\Nova_Training_Corpus\00_Analysis_Results"
 OUTPUT_FILE = r"C:\AI Fusion Labs\Nova_Training_Corpus\00_Analysis_Results\30K_ALTITUDE_SYNTHESIS.md"
-OLLAMA_URL = "http://localhost:11434/api/generate"
 MODEL_NAME = "llama3:latest"
 
-# How many analyses to feed per batch (adjust based on context limits)
+SYNTHESIS_OPTIONS = {
+    "temperature": 0.4,
+    "num_predict": 800,
+    "num_ctx": 8192       # context window every synthesis prompt is budgeted against
+}
+BATCH_TIMEOUT = 180   # seconds per batch synthesis
+FINAL_TIMEOUT = 300   # the final synthesis reads every batch, so give it longer
+STREAM = True         # stream tokens as they are generated (--no-stream to disable)
+
+# Most inputs fed to one batch. Batches shrink below this whenever the
+# measured summaries would overflow the context window.
 BATCH_SIZE = 15
 
+# Average batch length. A batch ends after any input whose name hashes to a
+# multiple of this, so boundaries depend on names rather than positions and
+# adding or removing one file only changes the batch it lands in.
+BATCH_TARGET = 8
+
+# Optional topic grouping (--semantic). Pull the model first: ollama pull nomic-embed-text
+EMBED_MODEL = "nomic-embed-text"
+EMBED_BATCH = 32      # texts per embedding request
+
+# Batches synthesized at once per server. Match the server's OLLAMA_NUM_PARALLEL.
+PARALLEL_REQUESTS = int(os.environ.get("OLLAMA_NUM_PARALLEL", "4"))
+
 # Synthesis prompts
 BATCH_SYNTHESIS_PROMPT = """You are a strategic analyst reviewing multiple AI agent development files.
 
@@ -49,6 +109,24 @@ FILES:
 Provide a CONCISE synthesis (bullet points, 200 words max).
 """
 
+# Upper levels of the tree merge batch syntheses rather than file summaries
+MERGE_SYNTHESIS_PROMPT = """You are a strategic analyst reviewing an AI Agent Factory project.
+
+Below are {count} syntheses, each covering a different group of project files.
+Merge them into ONE synthesis of the COMMON PATTERNS and KEY INSIGHTS across all groups.
+
+Focus on:
+1. What patterns repeat across groups?
+2. What are the most important learnings?
+3. What went wrong? What went right?
+4. What should be replicated for future agents?
+
+SYNTHESES:
+{summaries}
+
+Provide a CONCISE synthesis (bullet points, 200 words max).
+"""
+
 FINAL_SYNTHESIS_PROMPT = """You are the Chief Strategist for an AI Agent Factory.
 
 You have received batch syntheses from analyzing 174 files about Morgan (an AI sales agent) 
@@ -110,37 +188,91 @@ def read_file(filepath, max_chars=2000):
     except Exception as e:
         return f"[ERROR: {e}]"
 
-def call_ollama(prompt, model=MODEL_NAME, timeout=180):
-    """Send prompt to Ollama."""
-    try:
-        response = requests.post(
-            OLLAMA_URL,
-            json={
-                "model": model,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "temperature": 0.4,
-                    "num_predict": 800
-                }
-            },
-            timeout=timeout
-        )
-        if response.status_code == 200:
-            return response.json().get("response", "[NO RESPONSE]")
-        else:
-            return f"[OLLAMA ERROR: {response.status_code}]"
-    except Exception as e:
-        return f"[ERROR: {e}]"
+def is_boundary(label):
+    """Content-defined cut point: true for roughly 1 in BATCH_TARGET labels, always the same ones."""
+    return int(cache_key(label)[:8], 16) % BATCH_TARGET == 0
 
-def batch_files(files, batch_size):
-    """Split files into batches."""
-    for i in range(0, len(files), batch_size):
-        yield files[i:i + batch_size]
+def pack_batches(items, budget, max_items=BATCH_SIZE, content_cuts=True):
+    """Group consecutive (label, text) items into batches that fit the token budget.
+    
+    Batches normally end at content-defined boundaries (see is_boundary), so
+    they stay the same from run to run while their inputs do. A batch is also
+    cut early when the measured summaries would overflow the token budget or
+    reach max_items, so long inputs get fewer per batch. Every batch but the
+    last holds at least two inputs, so each level of the tree shrinks.
+    """
+    batches, current, current_tokens = [], [], 0
+    for item in items:
+        tokens = estimate_tokens(item[1])
+        if len(current) >= 2 and (current_tokens + tokens > budget or len(current) >= max_items):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(item)
+        current_tokens += tokens
+        if content_cuts and len(current) >= 2 and is_boundary(item[0]):
+            batches.append(current)
+            current, current_tokens = [], 0
+    if current:
+        batches.append(current)
+    return batches
+
+def embed_items(items, client, cache=None):
+    """Embedding vector for each (label, text) item, reusing cached vectors. None on failure."""
+    keys = [cache_key(text, EMBED_MODEL) for _, text in items]
+    vectors = [None] * len(items)
+    if cache is not None:
+        for i, key in enumerate(keys):
+            entry = cache.get(key)
+            if entry is not None:
+                vectors[i] = entry["vector"]
+    missing = [i for i, v in enumerate(vectors) if v is None]
+    for start in range(0, len(missing), EMBED_BATCH):
+        chunk = missing[start:start + EMBED_BATCH]
+        embedded = client.embed([items[i][1] for i in chunk], EMBED_MODEL)
+        if embedded is None or len(embedded) != len(chunk):
+            return None
+        for i, vector in zip(chunk, embedded):
+            vectors[i] = vector
+            if cache is not None:
+                cache.put(keys[i], {"model": EMBED_MODEL, "vector": vector})
+    if cache is not None:
+        cache.prune(keys)
+    print(f"🧭 Embedded {len(missing)} analyses ({len(items) - len(missing)} cached).")
+    return vectors
+
+def format_inputs(batch, level):
+    """Render a batch of (label, text) inputs the way the prompt for its level expects."""
+    if level == 0:
+        return "".join(f"\n--- {label} ---\n{text}\n" for label, text in batch)
+    return "\n\n".join(f"### {label}\n{text}" for label, text in batch)
 
 # ============= MAIN EXECUTION =============
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Synthesize all Nova analyses into the 30K altitude report.")
+    parser.add_argument("--resume", action="store_true", help="Reuse batches from the last run's journal")
+    parser.add_argument("--analysis-dir", default=ANALYSIS_DIR, help="Directory of analysis_*.md files")
+    parser.add_argument("--output", default=OUTPUT_FILE, help="Report path")
+    parser.add_argument("--no-stream", action="store_true", help="Wait for whole replies instead of streaming tokens")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore cached batch syntheses and embeddings")
+    parser.add_argument("--semantic", action="store_true",
+                        help=f"Group related analyses into the same batches using {EMBED_MODEL} embeddings")
+    parser.add_argument("--parallel", type=int, default=PARALLEL_REQUESTS,
+                        help="Batches synthesized at once per server (default: $OLLAMA_NUM_PARALLEL or 4)")
+    parser.add_argument("--hosts", default=",".join(OLLAMA_HOSTS),
+                        help="Comma-separated Ollama servers to spread batches over (default: $OLLAMA_HOSTS)")
+    return parser.parse_args()
+
+def echo_token(token):
+    sys.stdout.write(token)
+    sys.stdout.flush()
+
 def main():
+    global ANALYSIS_DIR, OUTPUT_FILE, STREAM
+    args = parse_args()
+    ANALYSIS_DIR, OUTPUT_FILE = args.analysis_dir, args.output
+    STREAM = STREAM and not args.no_stream
+
     print("=" * 60)
     print("🦅 Nova 30K Altitude Synthesizer (Phase 2)")
     print("=" * 60)
@@ -158,70 +290,242 @@ def main():
         print("No analysis files found. Run nova_overnight_analyzer.py first.")
         return
     
-    # Test Ollama
-    print("Testing Ollama connection...")
-    test = call_ollama("Say 'ready'")
-    if "ERROR" in test:
-        print(f"❌ {test}")
-        return
-    print("✅ Ollama connected.\n")
+    parallel = max(1, args.parallel)
+    run_metrics = RunMetrics("Nova 30K Synthesizer")
+    
+    # Journal: a synthesis is reused on --resume when the exact same prompt was
+    # answered before, which also means every input below it was unchanged
+    journal = RunJournal(os.path.join(ANALYSIS_DIR, "synthesis_journal.jsonl"))
+    run_info = {"model": MODEL_NAME,
+                "settings": cache_key(BATCH_SYNTHESIS_PROMPT, MERGE_SYNTHESIS_PROMPT, FINAL_SYNTHESIS_PROMPT,
+                                      BATCH_SIZE, BATCH_TARGET, SYNTHESIS_OPTIONS)}
+    records = journal.open(run_info, resume=args.resume)
+    journaled = {rec["key"]: rec for rec in records if rec.get("key")}
+    if journaled:
+        print(f"↩️  Resuming: {len(journaled)} syntheses available from journal.\n")
+    
+    cache = None if args.no_cache else AnalysisCache(os.path.join(ANALYSIS_DIR, ".synthesis_cache"))
+    used_keys = set()
+    
+    def reuse(key):
+        """A synthesis already produced for this exact prompt, from the journal or the cache."""
+        used_keys.add(key)
+        if key in journaled:
+            return journaled[key]["synthesis"]
+        entry = cache.get(key) if cache is not None else None
+        return entry["synthesis"] if entry is not None else None
+    
+    def store(key, synthesis, metrics=None):
+        # Replies cut short by a timeout retry are not kept for future runs
+        if cache is not None and not is_error(synthesis) and not (metrics or {}).get("num_predict"):
+            cache.put(key, {"model": MODEL_NAME, "synthesis": synthesis, "created": datetime.now().isoformat()})
     
-    # Phase 2A: Batch Synthesis
+    # One pooled client per server: every prompt reuses a kept-alive connection,
+    # at most `parallel` batches generate at once on each server, and each
+    # batch goes to the least busy one
+    hosts = [h.strip() for h in args.hosts.split(",") if h.strip()]
+    client = OllamaRouter(hosts, pool_size=parallel, max_in_flight=parallel)
+    for host, healthy, models in client.status():
+        print(f"🖥️  {host}: " + (f"✅ {len(models)} models" if healthy else "❌ not reachable"))
+    
+    # Test Ollama (not needed when the journal already holds a final synthesis)
+    if not any(rec.get("type") == "final" for rec in journaled.values()):
+        print("Testing Ollama connection...")
+        test, _ = client.generate("Say 'ready'", MODEL_NAME, SYNTHESIS_OPTIONS, timeout=BATCH_TIMEOUT, stream=STREAM)
+        if "ERROR" in test:
+            print(f"❌ {test}")
+            client.close()
+            journal.close()
+            return
+        print("✅ Ollama connected.\n")
+    
+    # Phase 2A: Tree Synthesis. Each level packs its inputs into batches that
+    # fit the context window and synthesizes them concurrently; levels repeat
+    # until the syntheses fit the final prompt.
     print("📦 Phase 2A: Batch Synthesis")
     print("-" * 40)
     
-    batch_syntheses = []
-    batches = list(batch_files(files, BATCH_SIZE))
-    total_batches = len(batches)
+    with run_metrics.stage("read"):
+        items = [(os.path.basename(f), read_file(f, max_chars=1500)) for f in files]
+        for f in files:
+            run_metrics.record("read", os.path.basename(f), bytes_read=os.path.getsize(f))
+    
+    # Optional: cluster the analyses by topic so each first-level batch is coherent
+    topics = None
+    if args.semantic:
+        embed_cache = None if args.no_cache else AnalysisCache(os.path.join(ANALYSIS_DIR, ".embedding_cache"))
+        with run_metrics.stage("embed"):
+            vectors = embed_items(items, client, embed_cache)
+        if vectors is None:
+            print(f"⚠️  Embeddings unavailable (is {EMBED_MODEL} pulled?); batching by name instead.")
+        else:
+            topics = [[items[i] for i in group] for group in topic_groups(vectors, BATCH_TARGET)]
+            print(f"🧭 {len(topics)} topic groups.")
+    
+    call_metrics = []
+    total_batches = 0
+    level = 0
+    
+    def synthesize(batch, template, level):
+        """[(label, key, synthesis, metrics, inputs)] for a batch. One that times out is split in half and retried."""
+        prompt = template.format(count=len(batch), summaries=format_inputs(batch, level))
+        key = cache_key(prompt, MODEL_NAME, SYNTHESIS_OPTIONS)
+        # Labelled by content, not position, so an unchanged batch keeps
+        # its label and the prompts above it stay cacheable
+        label = f"Batch {level + 1}.{key[:8]}"
+        synthesis = reuse(key)
+        if synthesis is not None:
+            run_metrics.record_call("batch", label, None, cached=True, inputs=len(batch))
+            return [(label, key, synthesis, None, len(batch))]
+        synthesis, metrics = client.generate(prompt, MODEL_NAME, SYNTHESIS_OPTIONS,
+                                             timeout=BATCH_TIMEOUT, stream=STREAM)
+        run_metrics.record_call("batch", label, metrics, inputs=len(batch), bytes_read=len(prompt.encode('utf-8')))
+        if timed_out(synthesis) and len(batch) > 1:
+            call_metrics.append(metrics)
+            half = len(batch) // 2
+            halves = [batch[:half], batch[half:]]
+            print(f"[{label}] ⏳ timed out; retrying as {len(halves[0])} + {len(halves[1])} inputs.")
+            # At level > 0 a lone half is carried up as-is, like any lone synthesis
+            return [entry for h in halves
+                    for entry in ([(h[0][0], None, h[0][1], None, 1)] if level > 0 and len(h) == 1
+                                  else synthesize(h, template, level))]
+        return [(label, key, synthesis, metrics, len(batch))]
     
     start_time = time.time()
     
-    for i, batch in enumerate(batches, 1):
-        print(f"[Batch {i}/{total_batches}] Processing {len(batch)} files...")
-        
-        # Read all files in batch
-        summaries = ""
-        for f in batch:
-            filename = os.path.basename(f)
-            content = read_file(f, max_chars=1500)
-            summaries += f"\n--- {filename} ---\n{content}\n"
-        
-        # Get batch synthesis
-        prompt = BATCH_SYNTHESIS_PROMPT.format(count=len(batch), summaries=summaries)
-        synthesis = call_ollama(prompt)
-        batch_syntheses.append(f"### Batch {i}\n{synthesis}")
-        
-        print(f"         ✅ Batch {i} synthesized.")
-        time.sleep(1)
+    final_budget = prompt_budget(FINAL_SYNTHESIS_PROMPT, SYNTHESIS_OPTIONS)
+    interrupted = False
+    with run_metrics.stage("batches"), ThreadPoolExecutor(max_workers=parallel * len(hosts)) as pool:
+        try:
+            while level == 0 or (len(items) > 1 and estimate_tokens(format_inputs(items, level)) > final_budget):
+                template = BATCH_SYNTHESIS_PROMPT if level == 0 else MERGE_SYNTHESIS_PROMPT
+                budget = prompt_budget(template, SYNTHESIS_OPTIONS)
+                if level == 0 and topics is not None:
+                    # Topic groups are split only where the budget forces it
+                    batches = [batch for group in topics
+                               for batch in pack_batches(group, budget, content_cuts=False)]
+                else:
+                    batches = pack_batches(items, budget)
+                mean_tokens = sum(estimate_tokens(text) for _, text in items) // len(items)
+                print(f"Level {level + 1}: {len(items)} inputs (~{mean_tokens} tokens each) -> {len(batches)} batches")
+            
+                # Each batch yields one synthesis, or several if it had to be split
+                next_items = [None] * len(batches)
+                futures = {}
+                reused = 0
+                for i, batch in enumerate(batches):
+                    if level > 0 and len(batch) == 1:
+                        # A lone synthesis is carried up as-is rather than re-summarized
+                        next_items[i] = [batch[0]]
+                        continue
+                    prompt = template.format(count=len(batch), summaries=format_inputs(batch, level))
+                    total_batches += 1
+                    if reuse(cache_key(prompt, MODEL_NAME, SYNTHESIS_OPTIONS)) is not None:
+                        reused += 1
+                    futures[pool.submit(synthesize, batch, template, level)] = i
+                if reused:
+                    print(f"♻️  {reused}/{len(futures)} batches unchanged, reused.")
+            
+                for future in as_completed(futures):
+                    i = futures[future]
+                    entries = future.result()
+                    next_items[i] = [(label, synthesis) for label, _, synthesis, _, _ in entries]
+                    total_batches += sum(1 for entry in entries if entry[1]) - 1
+                    for label, key, synthesis, metrics, count in entries:
+                        if metrics is None:
+                            continue
+                        call_metrics.append(metrics)
+                        store(key, synthesis, metrics)
+                        if not is_error(synthesis):
+                            journal.append("batch", level=level + 1, batch=i + 1, key=key, synthesis=synthesis,
+                                           metrics=metrics)
+                        print(f"[{label}] ✅ {count} inputs synthesized. {format_metrics(metrics)}")
+            
+                merged = [item for group in next_items for item in group]
+                progress = level == 0 or len(merged) < len(items)
+                items = merged
+                level += 1
+                if not progress:
+                    # Every batch timed out down to lone inputs: another level
+                    # would rebuild the same batches, so go to the final synthesis
+                    print(f"⚠️  Level {level} made no progress ({len(items)} inputs left); "
+                          f"continuing with the final synthesis.")
+                    break
+        except KeyboardInterrupt:
+            # Drop the queued batches; the with-block still waits for calls already in flight
+            pool.shutdown(wait=False, cancel_futures=True)
+            interrupted = True
+            print("\n🛑 Interrupted; waiting for batches in flight (Ctrl+C again to quit now).")
+    
+    if interrupted:
+        client.close()
+        journal.close()
+        print("Completed batches are journaled; run again with --resume to continue.")
+        return
     
     # Phase 2B: Final 30K Synthesis
     print("\n🦅 Phase 2B: Final 30K Altitude Synthesis")
     print("-" * 40)
     
-    all_batches = "\n\n".join(batch_syntheses)
-    final_prompt = FINAL_SYNTHESIS_PROMPT.format(all_batches=all_batches)
+    final_prompt = FINAL_SYNTHESIS_PROMPT.format(all_batches=format_inputs(items, level))
+    final_key = cache_key(final_prompt, MODEL_NAME, SYNTHESIS_OPTIONS)
+    final_synthesis = reuse(final_key)
+    if final_synthesis is not None:
+        print("♻️  Nothing changed below the final synthesis; reused.")
+        run_metrics.record_call("final", "final", None, cached=True)
+    else:
+        print("Generating strategic synthesis (this may take a minute)...\n")
+        with run_metrics.stage("final"):
+            final_synthesis, metrics = client.generate(final_prompt, MODEL_NAME, SYNTHESIS_OPTIONS,
+                                                       timeout=FINAL_TIMEOUT, stream=STREAM,
+                                                       partial_path=OUTPUT_FILE + ".partial", on_token=echo_token)
+        run_metrics.record_call("final", "final", metrics, bytes_read=len(final_prompt.encode('utf-8')))
+        call_metrics.append(metrics)
+        store(final_key, final_synthesis, metrics)
+        print(f"\n\n✅ Final synthesis generated. {format_metrics(metrics)}")
+        if not is_error(final_synthesis):
+            journal.append("final", key=final_key, synthesis=final_synthesis, metrics=metrics)
+    client.close()
+    journal.close()
     
-    print("Generating strategic synthesis (this may take a minute)...")
-    final_synthesis = call_ollama(final_prompt, timeout=300)
+    # Drop syntheses of batches that no longer exist
+    if cache is not None:
+        pruned = cache.prune(used_keys)
+        if pruned:
+            print(f"🧹 Pruned {pruned} stale batch syntheses.")
     
     # Save output
     total_time = (time.time() - start_time) / 60
+    summary = summarize_metrics(call_metrics)
     
     with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
         f.write(final_synthesis)
         f.write(f"\n\n---\n\n")
         f.write(f"*Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*\n")
         f.write(f"*Files Analyzed: {total_files}*\n")
-        f.write(f"*Batches Processed: {total_batches}*\n")
+        f.write(f"*Batches Processed: {total_batches} over {level} levels*\n")
         f.write(f"*Total Time: {total_time:.1f} minutes*\n")
+        if summary["tokens_per_sec"]:
+            f.write(f"*Generation Speed: {summary['tokens_per_sec']:.1f} tokens/sec over {summary['calls']} calls*\n")
+    
+    metrics_path = run_metrics.save(os.path.join(ANALYSIS_DIR, "synthesis_metrics.json"), top_phase="batch")
+    with open(os.path.join(ANALYSIS_DIR, "synthesis_metrics.md"), 'w', encoding='utf-8') as f:
+        f.write(run_metrics.format_summary(top_phase="batch"))
     
     print("\n" + "=" * 60)
     print("✅ 30K ALTITUDE SYNTHESIS COMPLETE!")
     print("=" * 60)
     print(f"Files Synthesized: {total_files}")
-    print(f"Batches Processed: {total_batches}")
+    print(f"Batches Processed: {total_batches} over {level} levels")
     print(f"Total Time: {total_time:.1f} minutes")
+    if summary["calls"]:
+        if summary["mean_ttft"] is not None:
+            print(f"Mean Time To First Token: {summary['mean_ttft']:.2f}s")
+        if summary["tokens_per_sec"]:
+            print(f"Generation Speed: {summary['tokens_per_sec']:.1f} tokens/sec")
+    run_metrics.print_summary(top_phase="batch")
     print(f"Output: {OUTPUT_FILE}")
+    print(f"Run Metrics: {metrics_path} (+ synthesis_metrics.md)")
     print("=" * 60)
 
 if __name__ == "__main__":
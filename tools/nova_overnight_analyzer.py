@@ -6,7 +6,42 @@ Batch-processes all files in Nova_Training_Corpus through Ollama (Nova model).
 Run this before bed and wake up to a comprehensive analysis report.
 
 Usage:
-    python nova_overnight_analyzer.py
+    python nova_overnight_analyzer.py [--parallel N] [--corpus DIR] [--output DIR] [--no-cache] [--no-stream] [--no-dedup]
+                                      [--include GLOB ...] [--exclude GLOB ...] [--hosts URL,URL]
+    python nova_overnight_analyzer.py --resume     # continue an interrupted run
+
+Unchanged files are served from a content-hash cache in OUTPUT_DIR/.analysis_cache,
+so nightly reruns only send new or edited files to the model. Every finished
+file is also appended to OUTPUT_DIR/run_journal.jsonl; --resume picks up from it.
+
+Replies are streamed: each analysis grows in analysis_<file>.md.partial while
+the model writes it, and per-call TTFT / tokens-per-second figures are saved
+to OUTPUT_DIR/generation_metrics.json and summarized in the master report.
+Every call and file is also recorded (latency, queue wait, tokens, bytes,
+cache hits, retries) in OUTPUT_DIR/run_metrics.json, with p50/p95/p99
+tables, latency histograms and the slowest files in run_metrics.md.
+
+Files longer than the context window (num_ctx) are never truncated: they are
+split on heading/section boundaries, the parts are analyzed in parallel, and
+the part analyses are merged into one analysis per file.
+
+Near-duplicate files (e.g. "X (1).txt" beside "X.txt", or successive versions
+of one prompt) are detected up front; only one file per group is analyzed and
+the others get a short diff note pointing at its analysis.
+
+Files are discovered with a concurrent directory walk filtered by
+gitignore-style include/exclude globs (plus an optional .novaignore in the
+corpus root); OUTPUT_DIR is never re-ingested even when it sits inside the
+corpus. The largest files are sent to the model first, so a big file picked
+up last doesn't leave one request running long after the rest are done.
+
+Work can be spread over several Ollama servers (OLLAMA_HOSTS / --hosts):
+each call goes to the least busy healthy server that has the model pulled.
+Files of up to SMALL_FILE_TOKENS go to the faster SMALL_MODEL when a server
+has it; everything else goes to MODEL_NAME.
+
+MASTER_ANALYSIS_REPORT.md is written as files finish, so it can be opened
+mid-run; the table of contents is merged in when the run completes.
 
 Requirements:
     - Ollama running locally (ollama serve)
@@ -21,16 +56,51 @@ import os
 import sys
 import json
 import time
-import requests
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from pathlib import Path
+
+from analysis_cache import AnalysisCache, cache_key, is_error
+from chunking import chunk_text, estimate_tokens, prompt_budget
+from corpus_discovery import DEFAULT_EXCLUDE, DEFAULT_INCLUDE, discover
+from near_duplicates import diff_summary, near_duplicate_groups
+from ollama_client import format_metrics, summarize_metrics, timed_out
+from ollama_router import OLLAMA_HOSTS, OllamaRouter
+from run_journal import RunJournal
+from run_metrics import RunMetrics
 
 # ============= CONFIGURATION =============
 CORPUS_PATH = r"C:\AI Fusion Labs\Nova_Training_Corpus"
 OUTPUT_DIR = r"C:\AI Fusion Labs\Nova_Training_Corpus\00_Analysis_Results"
-OLLAMA_URL = "http://localhost:11434/api/generate"
 MODEL_NAME = "llama3:latest"  # Change to your preferred model (e.g., "mistral", "gemma3:4b")
 
+# Short files go to this faster model when a server has it pulled (None to disable)
+SMALL_MODEL = "llama3.2:3b"
+SMALL_FILE_TOKENS = 2000
+
+ANALYSIS_OPTIONS = {
+    "temperature": 0.3,
+    "num_predict": 1000,
+    "num_ctx": 8192       # context window; long files are chunked to fit it
+}
+REQUEST_TIMEOUT = 120  # seconds of silence from the model before a call is abandoned
+STREAM = True          # stream tokens as they are generated (--no-stream to disable)
+
+# A file or part whose call times out is re-split into halves down to this size
+MIN_CHUNK_TOKENS = 500
+
+# Gitignore-style globs choosing which corpus files are analyzed
+# (a .novaignore file in the corpus root adds more exclude rules)
+INCLUDE_PATTERNS = DEFAULT_INCLUDE
+EXCLUDE_PATTERNS = DEFAULT_EXCLUDE
+
+# Files whose word shingles overlap at least this much are treated as copies
+DEDUP_THRESHOLD = 0.9
+
+# Requests kept in flight at once per server. Match the server's OLLAMA_NUM_PARALLEL
+# so Ollama can batch them; 1 reproduces the old one-file-at-a-time behaviour.
+PARALLEL_REQUESTS = int(os.environ.get("OLLAMA_NUM_PARALLEL", "4"))
+
 # Analysis prompt template
 ANALYSIS_PROMPT = """You are an AI systems analyst reviewing files from an AI Agent Factory project.
 
@@ -47,74 +117,217 @@ FILE CONTENT:
 Respond in clean markdown format.
 """
 
+# Files too long for one prompt are analyzed part by part...
+CHUNK_PROMPT = """You are an AI systems analyst reviewing files from an AI Agent Factory project.
+
+This is PART {part} of {parts} of a file too long to review in one go.
+Analyze this part and provide:
+1. **Summary**: What does this part cover? (2-3 sentences)
+2. **Key Insights**: What are the most important learnings? (bullet points)
+3. **Reusable Patterns**: What can be extracted as a template for future agents?
+4. **Improvements**: Any suggestions for optimization?
+
+FILE NAME: {filename}
+PART CONTENT:
+{content}
+
+Respond in clean markdown format.
+"""
+
+# ...and the part analyses are then merged into one analysis of the whole file
+MERGE_PROMPT = """You are an AI systems analyst reviewing files from an AI Agent Factory project.
+
+Below are analyses of consecutive parts of one file. Merge them into a single
+analysis of the WHOLE file, removing repetition, with these sections:
+1. **Summary**: What is this file about? (2-3 sentences)
+2. **Key Insights**: What are the most important learnings? (bullet points)
+3. **Reusable Patterns**: What can be extracted as a template for future agents?
+4. **Improvements**: Any suggestions for optimization?
+
+FILE NAME: {filename}
+PART ANALYSES:
+{analyses}
+
+Respond in clean markdown format.
+"""
+
 # ============= HELPER FUNCTIONS =============
 
-def get_all_files(directory):
-    """Recursively get all text files from directory."""
-    extensions = {'.txt', '.md', '.json', '.py', '.ts', '.tsx', '.js', '.jsx'}
-    files = []
-    for root, dirs, filenames in os.walk(directory):
-        # Skip hidden directories
-        dirs[:] = [d for d in dirs if not d.startswith('.')]
-        for filename in filenames:
-            if Path(filename).suffix.lower() in extensions:
-                files.append(os.path.join(root, filename))
-    return files
-
-def read_file_content(filepath, max_chars=8000):
-    """Read file content with size limit."""
+def get_all_files(directory, include=INCLUDE_PATTERNS, exclude=EXCLUDE_PATTERNS):
+    """[(path, size)] of the corpus files to analyze, in path order.
+
+    The output directory is always skipped, so earlier reports and cached
+    analyses are never fed back in as corpus files.
+    """
+    return discover(directory, include, exclude, skip=[OUTPUT_DIR])
+
+def read_file_content(filepath):
+    """Read the whole file. Long files are chunked for the model, never truncated."""
     try:
         with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-            if len(content) > max_chars:
-                content = content[:max_chars] + "\n\n[... TRUNCATED ...]"
-            return content
+            return f.read()
     except Exception as e:
         return f"[ERROR READING FILE: {e}]"
 
-def call_ollama(prompt, model=MODEL_NAME):
-    """Send prompt to Ollama and get response."""
-    try:
-        response = requests.post(
-            OLLAMA_URL,
-            json={
-                "model": model,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "temperature": 0.3,
-                    "num_predict": 1000
-                }
-            },
-            timeout=120
-        )
-        if response.status_code == 200:
-            return response.json().get("response", "[NO RESPONSE]")
-        else:
-            return f"[OLLAMA ERROR: {response.status_code}]"
-    except requests.exceptions.ConnectionError:
-        return "[ERROR: Ollama not running. Start with 'ollama serve']"
-    except Exception as e:
-        return f"[ERROR: {e}]"
+def analysis_filename(relative_path):
+    """Name of the per-file analysis written to OUTPUT_DIR."""
+    safe_name = relative_path.replace("\\", "_").replace("/", "_").replace(" ", "_")
+    return f"analysis_{safe_name}.md"
+
+def run_prompt(prompt, relative_path, client, cache=None, partial_path=None, model=MODEL_NAME, phase="analyze"):
+    """One model call, served from the cache when the exact prompt was answered before.
+    
+    phase ("analyze", "chunk" or "merge") labels the call in the run metrics.
+    """
+    key = cache_key(prompt, model, ANALYSIS_OPTIONS)
+    
+    if cache is not None:
+        entry = cache.get(key)
+        if entry is not None:
+            return {"analysis": entry["analysis"], "key": key, "cached": True, "metrics": None, "phase": phase}
+    
+    analysis, metrics = client.generate(prompt, model, ANALYSIS_OPTIONS, timeout=REQUEST_TIMEOUT,
+                                        stream=STREAM, partial_path=partial_path)
+    
+    # Failed calls are never cached so the next run retries them, and neither
+    # are replies cut short by a timeout retry (metrics["num_predict"] is set)
+    if cache is not None and not is_error(analysis) and not metrics.get("num_predict"):
+        cache.put(key, {"file": relative_path, "model": model, "analysis": analysis,
+                        "created": datetime.now().isoformat()})
+    
+    return {"analysis": analysis, "key": key, "cached": False, "metrics": metrics, "phase": phase}
+
+def merge_analyses(labelled, relative_path, client, cache, chunk_pool, partial_path):
+    """Merge [(label, analysis)] into one analysis, in rounds if they overflow the context.
+    
+    Returns (calls, final): every call made, and the one whose text is the result.
+    """
+    calls = []
+    budget = prompt_budget(MERGE_PROMPT, ANALYSIS_OPTIONS)
+    while True:
+        # chunk_text splits on the '### ' headings, so each group holds whole part analyses
+        text = "\n".join(f"### {label}\n{analysis}\n" for label, analysis in labelled)
+        groups = chunk_text(text, budget)
+        if len(groups) == 1 or len(groups) >= len(labelled):
+            prompt = MERGE_PROMPT.format(filename=relative_path, analyses=text)
+            calls.append(run_prompt(prompt, relative_path, client, cache, partial_path, phase="merge"))
+            return calls, calls[-1]
+        # Too many part analyses for one prompt: merge neighbouring groups first
+        prompts = [MERGE_PROMPT.format(filename=relative_path, analyses=group) for group in groups]
+        round_calls = list(chunk_pool.map(lambda p: run_prompt(p, relative_path, client, cache, phase="merge"),
+                                          prompts))
+        calls.extend(round_calls)
+        failed = next((c for c in round_calls if is_error(c["analysis"])), None)
+        if failed is not None:
+            return calls, failed
+        labelled = [(f"Merged group {n}", c["analysis"]) for n, c in enumerate(round_calls, 1)]
 
-def analyze_file(filepath):
-    """Analyze a single file."""
-    filename = os.path.basename(filepath)
+def combine_metrics(calls, wall):
+    """Fold the metrics of every model call made for one file into a single record."""
+    live = [c["metrics"] for c in calls if c["metrics"]]
+    if not live:
+        return None
+    eval_count = sum(m.get("eval_count") or 0 for m in live)
+    eval_duration = sum(m.get("eval_duration") or 0 for m in live)
+    ttfts = [m["ttft"] for m in live if m.get("ttft") is not None]
+    return {"model": ", ".join(sorted({m["model"] for m in live})), "calls": len(live), "streamed": STREAM,
+            "ttft": min(ttfts) if ttfts else None, "total": wall,
+            "eval_count": eval_count, "eval_duration": eval_duration,
+            "tokens_per_sec": eval_count / eval_duration if eval_duration else None}
+
+def analyze_file(filepath, client, cache=None, chunk_pool=None, submitted=None):
+    """Analyze a single file, reusing cached analyses for anything that did not change.
+    
+    Files that fit the context window get one call. Longer files are split
+    on section boundaries, the parts are analyzed in parallel on chunk_pool,
+    and the part analyses are merged into one analysis for the file. When a
+    call times out, the file is split again into parts half the size. Short
+    files go to SMALL_MODEL (if set), everything else to MODEL_NAME.
+    
+    submitted is the perf_counter() time the file was queued, for the run
+    metrics; "calls" in the result lists every call made, for the same.
+    """
     relative_path = os.path.relpath(filepath, CORPUS_PATH)
     content = read_file_content(filepath)
+    # While streaming, the analysis so far can be read from the .partial file
+    partial_path = os.path.join(OUTPUT_DIR, analysis_filename(relative_path) + ".partial")
+    started = time.perf_counter()
+    queue_wait = started - submitted if submitted is not None else 0.0
+    tokens = estimate_tokens(content)
     
-    prompt = ANALYSIS_PROMPT.format(filename=relative_path, content=content)
-    analysis = call_ollama(prompt)
+    calls = []
+    parts = 1
+    if chunk_pool is None or tokens <= prompt_budget(ANALYSIS_PROMPT, ANALYSIS_OPTIONS):
+        prompt = ANALYSIS_PROMPT.format(filename=relative_path, content=content)
+        model = SMALL_MODEL if SMALL_MODEL and tokens <= SMALL_FILE_TOKENS else MODEL_NAME
+        calls = [run_prompt(prompt, relative_path, client, cache, partial_path, model)]
+        final = calls[0]
+        # Timed out as a whole: try again as two or more smaller parts
+        retry = chunk_pool is not None and timed_out(final["analysis"]) and tokens // 2 >= MIN_CHUNK_TOKENS
+        budget = tokens // 2 if retry else 0
+    else:
+        budget = prompt_budget(CHUNK_PROMPT, ANALYSIS_OPTIONS)
+    
+    while budget:
+        chunks = chunk_text(content, budget)
+        parts = len(chunks)
+        prompts = [CHUNK_PROMPT.format(filename=relative_path, part=n, parts=parts, content=chunk)
+                   for n, chunk in enumerate(chunks, 1)]
+        part_calls = list(chunk_pool.map(lambda p: run_prompt(p, relative_path, client, cache, phase="chunk"),
+                                         prompts))
+        calls.extend(part_calls)
+        # A failed part fails the file; the parts that succeeded stay cached for the retry
+        final = next((c for c in part_calls if is_error(c["analysis"])), None)
+        if final is None:
+            labelled = [(f"Part {n}/{parts}", c["analysis"]) for n, c in enumerate(part_calls, 1)]
+            merge_calls, final = merge_analyses(labelled, relative_path, client, cache, chunk_pool, partial_path)
+            calls.extend(merge_calls)
+        # Parts that timed out: split finer and try again
+        if any(timed_out(c["analysis"]) for c in part_calls) and budget // 2 >= MIN_CHUNK_TOKENS:
+            budget //= 2
+        else:
+            budget = 0
     
     return {
         "file": relative_path,
-        "analysis": analysis
+        "analysis": final["analysis"],
+        "key": final["key"],
+        # Hash of the file as analyzed, so --resume can tell if it has changed since
+        "content": cache_key(content),
+        # Every cache entry this analysis depends on, so pruning keeps the part analyses too
+        "keys": sorted({c["key"] for c in calls}),
+        "cached": all(c["cached"] for c in calls),
+        "parts": parts,
+        "metrics": combine_metrics(calls, time.perf_counter() - started),
+        "calls": [{"phase": c["phase"], "cached": c["cached"], "metrics": c["metrics"]} for c in calls],
+        "queue_wait": queue_wait
     }
 
+def find_duplicates(files):
+    """Map each near-duplicate file's index to the index of the file analyzed in its place."""
+    texts = [read_file_content(f) for f in files]
+    duplicate_of = {}
+    for group in near_duplicate_groups(texts, DEDUP_THRESHOLD):
+        # The fullest version stands for the group; ties go to the shortest, then first, path
+        rep = min(group, key=lambda i: (-len(texts[i]), len(files[i]), files[i]))
+        for i in group:
+            if i != rep:
+                duplicate_of[i] = rep
+    return duplicate_of
+
+def duplicate_result(filepath, rep_path):
+    """Stand-in analysis for a near-duplicate: a pointer to its representative plus a diff."""
+    relative_path = os.path.relpath(filepath, CORPUS_PATH)
+    rep_relative = os.path.relpath(rep_path, CORPUS_PATH)
+    diff = diff_summary(read_file_content(rep_path), read_file_content(filepath))
+    note = (f"**Near-duplicate of `{rep_relative}`** (not sent to the model; see that file's analysis).\n\n"
+            f"#### Differences\n\n{diff}\n")
+    return {"file": relative_path, "analysis": note, "key": None, "keys": [], "cached": False,
+            "parts": 1, "metrics": None, "duplicate_of": rep_relative}
+
 def save_individual_analysis(result, output_dir):
     """Save individual file analysis."""
-    safe_name = result["file"].replace("\\", "_").replace("/", "_").replace(" ", "_")
-    output_file = os.path.join(output_dir, f"analysis_{safe_name}.md")
+    output_file = os.path.join(output_dir, analysis_filename(result["file"]))
     
     with open(output_file, 'w', encoding='utf-8') as f:
         f.write(f"# Analysis: {result['file']}\n\n")
@@ -122,16 +335,94 @@ def save_individual_analysis(result, output_dir):
     
     return output_file
 
-def create_master_report(results, output_dir, total_time):
-    """Create master synthesis report."""
-    report_path = os.path.join(output_dir, "MASTER_ANALYSIS_REPORT.md")
+def save_metrics(results, output_dir):
+    """Write per-call generation metrics (files actually sent to the model) as JSON."""
+    calls = [dict(r["metrics"], file=r["file"]) for r in results if r.get("metrics")]
+    metrics_path = os.path.join(output_dir, "generation_metrics.json")
+    with open(metrics_path, 'w', encoding='utf-8') as f:
+        json.dump({"model": MODEL_NAME, "summary": summarize_metrics(calls), "calls": calls}, f, indent=2)
+    return metrics_path
+
+def format_section(index, result):
+    """One file's section of the master report."""
+    lines = [f"### <a name=\"{index}\"></a>{index}. {result['file']}\n\n"]
+    if result.get("parts", 1) > 1:
+        lines.append(f"*Analyzed in {result['parts']} parts*\n\n")
+    if result.get("metrics"):
+        lines.append(f"*{format_metrics(result['metrics'])}*\n\n")
+    lines.append(result["analysis"])
+    lines.append("\n\n---\n\n")
+    return "".join(lines)
+
+class MasterReportWriter:
+    """Builds MASTER_ANALYSIS_REPORT.md while the run goes.
+    
+    During the run the report file is an append-only spool: a short
+    "in progress" header followed by each file's section as soon as it
+    finishes, so a partial report can be opened at any time. Only the byte
+    offset of each section is kept in memory. create_master_report() then
+    writes the final header and table of contents and copies the sections
+    back in corpus order, one section at a time.
+    """
+    
+    def __init__(self, output_dir, total_files):
+        self.path = os.path.join(output_dir, "MASTER_ANALYSIS_REPORT.md")
+        self.offsets = {}   # corpus index -> (offset, length) in the spool
+        self._spool = open(self.path, 'wb')
+        self._spool.write((
+            "# 🧠 Nova Overnight Analysis Report\n\n"
+            f"**Run In Progress:** started {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}, {total_files} files. "
+            "Analyses are appended below as they finish; the table of contents is added when the run completes.\n\n"
+            "---\n\n## 📊 File Analyses\n\n").encode('utf-8'))
+        self._spool.flush()
     
-    with open(report_path, 'w', encoding='utf-8') as f:
+    def add(self, index, result):
+        data = format_section(index, result).encode('utf-8')
+        self.offsets[index] = (self._spool.tell(), len(data))
+        self._spool.write(data)
+        self._spool.flush()
+    
+    def sections(self):
+        """Spooled sections in corpus order, read back one at a time."""
+        with open(self.path, 'rb') as spool:
+            for index in sorted(self.offsets):
+                offset, length = self.offsets[index]
+                spool.seek(offset)
+                yield spool.read(length).decode('utf-8')
+    
+    def close(self):
+        self._spool.close()
+
+def create_master_report(writer, results, total_time, parallel=1, calls_saved=0):
+    """Replace the spooled report with the final one: header, table of contents, sections in order."""
+    tmp_path = writer.path + ".tmp"
+    
+    with open(tmp_path, 'w', encoding='utf-8') as f:
         f.write("# 🧠 Nova Overnight Analysis Report\n\n")
         f.write(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
         f.write(f"**Files Analyzed:** {len(results)}\n")
         f.write(f"**Total Runtime:** {total_time:.1f} minutes\n")
-        f.write(f"**Model Used:** {MODEL_NAME}\n\n")
+        if total_time > 0:
+            f.write(f"**Throughput:** {len(results) / total_time:.1f} files/min ({parallel} in flight)\n")
+        f.write(f"**Model Used:** {MODEL_NAME}\n")
+        if SMALL_MODEL:
+            f.write(f"**Small Files (≤{SMALL_FILE_TOKENS} tokens):** {SMALL_MODEL}\n")
+        duplicates = sum(1 for r in results if r.get("duplicate_of"))
+        if duplicates:
+            f.write(f"**Near-Duplicates Skipped:** {duplicates} ({calls_saved} LLM calls saved)\n")
+        f.write("\n")
+        
+        summary = summarize_metrics([r.get("metrics") for r in results])
+        if summary["calls"]:
+            f.write("## ⏱️ Generation Metrics\n\n")
+            f.write(f"- **LLM Calls:** {summary['calls']}\n")
+            if summary["mean_ttft"] is not None:
+                f.write(f"- **Mean Time To First Token:** {summary['mean_ttft']:.2f}s\n")
+            f.write(f"- **Mean Call Time:** {summary['mean_total']:.1f}s\n")
+            f.write(f"- **Tokens Generated:** {summary['eval_count']}\n")
+            if summary["tokens_per_sec"]:
+                f.write(f"- **Generation Speed:** {summary['tokens_per_sec']:.1f} tokens/sec\n")
+            f.write("\n")
         f.write("---\n\n")
         
         # Table of Contents
@@ -140,31 +431,65 @@ def create_master_report(results, output_dir, total_time):
             f.write(f"{i}. [{result['file']}](#{i})\n")
         f.write("\n---\n\n")
         
-        # Individual Analyses
+        # Individual Analyses, copied from the spool
         f.write("## 📊 File Analyses\n\n")
-        for i, result in enumerate(results, 1):
-            f.write(f"### <a name=\"{i}\"></a>{i}. {result['file']}\n\n")
-            f.write(result["analysis"])
-            f.write("\n\n---\n\n")
+        for section in writer.sections():
+            f.write(section)
     
-    return report_path
+    writer.close()
+    os.replace(tmp_path, writer.path)
+    return writer.path
 
 # ============= MAIN EXECUTION =============
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Batch-analyze the Nova corpus through Ollama.")
+    parser.add_argument("--parallel", type=int, default=PARALLEL_REQUESTS,
+                        help="Max requests in flight per server (default: $OLLAMA_NUM_PARALLEL or 4)")
+    parser.add_argument("--hosts", default=",".join(OLLAMA_HOSTS),
+                        help="Comma-separated Ollama servers to spread work over (default: $OLLAMA_HOSTS)")
+    parser.add_argument("--corpus", default=CORPUS_PATH, help="Corpus directory")
+    parser.add_argument("--output", default=OUTPUT_DIR, help="Output directory")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore cached analyses and re-analyze every file")
+    parser.add_argument("--resume", action="store_true", help="Continue the last run from its journal")
+    parser.add_argument("--no-stream", action="store_true", help="Wait for whole replies instead of streaming tokens")
+    parser.add_argument("--no-dedup", action="store_true", help="Analyze near-duplicate files individually too")
+    parser.add_argument("--include", action="append", metavar="GLOB",
+                        help="Only analyze files matching GLOB (repeatable; replaces the default extensions)")
+    parser.add_argument("--exclude", action="append", default=[], metavar="GLOB",
+                        help="Skip files/dirs matching GLOB, gitignore-style (repeatable; '!GLOB' re-includes)")
+    return parser.parse_args()
+
 def main():
+    global CORPUS_PATH, OUTPUT_DIR, STREAM, SMALL_MODEL
+    args = parse_args()
+    CORPUS_PATH, OUTPUT_DIR = args.corpus, args.output
+    STREAM = STREAM and not args.no_stream
+    parallel = max(1, args.parallel)
+    hosts = [h.strip() for h in args.hosts.split(",") if h.strip()]
+
     print("=" * 60)
     print("🧠 Nova Overnight Analyzer")
     print("=" * 60)
     print(f"Corpus Path: {CORPUS_PATH}")
     print(f"Model: {MODEL_NAME}")
+    print(f"Parallel Requests: {parallel} per server")
     print(f"Start Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("-" * 60)
     
     # Create output directory
     os.makedirs(OUTPUT_DIR, exist_ok=True)
+    run_metrics = RunMetrics("Nova Overnight Analyzer")
     
     # Get all files
-    files = get_all_files(CORPUS_PATH)
+    try:
+        with run_metrics.stage("discovery"):
+            found = get_all_files(CORPUS_PATH, args.include or INCLUDE_PATTERNS, EXCLUDE_PATTERNS + args.exclude)
+    except KeyboardInterrupt:
+        print("\n🛑 Discovery cancelled.")
+        return
+    files = [path for path, _ in found]
+    sizes = [size for _, size in found]
     total_files = len(files)
     print(f"Found {total_files} files to analyze.\n")
     
@@ -172,53 +497,202 @@ def main():
         print("No files found. Check CORPUS_PATH.")
         return
     
-    # Test Ollama connection
-    print("Testing Ollama connection...")
-    test = call_ollama("Say 'ready' if you're online.", MODEL_NAME)
-    if "ERROR" in test:
-        print(f"❌ {test}")
-        print("\nMake sure Ollama is running: ollama serve")
-        return
-    print("✅ Ollama connected.\n")
+    cache = None if args.no_cache else AnalysisCache(os.path.join(OUTPUT_DIR, ".analysis_cache"))
+    
+    # One pooled, throttled client per server; each call goes to the least busy
+    # healthy one. It also caps calls in flight, since chunk calls run on their own pool.
+    client = OllamaRouter(hosts, pool_size=parallel, max_in_flight=parallel)
+    for host, healthy, models in client.status():
+        print(f"🖥️  {host}: " + (f"✅ {len(models)} models" if healthy else "❌ not reachable"))
+    if SMALL_MODEL and not client.has_model(SMALL_MODEL):
+        print(f"ℹ️  {SMALL_MODEL} not pulled on any server; all files go to {MODEL_NAME}.")
+        SMALL_MODEL = None
+    capacity = parallel * len(hosts)
+    print()
+    
+    # Journal: reuse whatever an interrupted run already finished
+    journal = RunJournal(os.path.join(OUTPUT_DIR, "run_journal.jsonl"))
+    run_info = {"corpus": os.path.abspath(CORPUS_PATH), "model": MODEL_NAME,
+                "settings": cache_key(ANALYSIS_PROMPT, CHUNK_PROMPT, MERGE_PROMPT, ANALYSIS_OPTIONS,
+                                      SMALL_MODEL, SMALL_FILE_TOKENS)}
+    journaled = {rec["file"]: rec for rec in journal.open(run_info, resume=args.resume)
+                 if rec.get("type") == "file"}
+    
+    # Process files. Results are slotted by corpus position so the master
+    # report keeps file order no matter which request finishes first. Once a
+    # result's section is in the report spool its analysis text is dropped,
+    # so memory does not grow with the corpus.
+    results = [None] * total_files
+    pending = []
+    changed = 0
+    for i, filepath in enumerate(files):
+        rec = journaled.get(os.path.relpath(filepath, CORPUS_PATH))
+        if rec is not None and rec.get("content") != cache_key(read_file_content(filepath)):
+            # Edited since it was journaled: analyze it again
+            changed += 1
+            rec = None
+        if rec is not None:
+            results[i] = {"file": rec["file"], "analysis": rec["analysis"], "key": rec.get("key"),
+                          "keys": rec.get("keys", [rec.get("key")]), "cached": True,
+                          "parts": rec.get("parts", 1), "metrics": rec.get("metrics")}
+        else:
+            pending.append(i)
+    restored = total_files - len(pending)
+    if journaled:
+        note = f" ({changed} changed since, re-queued)" if changed else ""
+        print(f"↩️  Resuming: {restored} files restored from journal{note}, {len(pending)} to go.\n")
+    
+    # Near-duplicate pre-pass: a near-copy of another file gets a diff note
+    # instead of its own trip through the model
+    with run_metrics.stage("dedup"):
+        duplicate_of = {} if args.no_dedup else find_duplicates(files)
+    skipped = [i for i in pending if i in duplicate_of]
+    for i in skipped:
+        results[i] = duplicate_result(files[i], files[duplicate_of[i]])
+        save_individual_analysis(results[i], OUTPUT_DIR)
+    if skipped:
+        pending = [i for i in pending if i not in duplicate_of]
+        groups = len({duplicate_of[i] for i in skipped})
+        print(f"🪞 {len(skipped)} near-duplicates in {groups} groups will not be sent to the model.\n")
+    
+    # Test Ollama connection (not needed when the journal already has everything)
+    if pending:
+        print("Testing Ollama connection...")
+        test, _ = client.generate("Say 'ready' if you're online.", MODEL_NAME, ANALYSIS_OPTIONS,
+                                  timeout=REQUEST_TIMEOUT, stream=STREAM)
+        if "ERROR" in test:
+            print(f"❌ {test}")
+            print("\nMake sure Ollama is running: ollama serve")
+            client.close()
+            journal.close()
+            return
+        print("✅ Ollama connected.\n")
+    
+    writer = MasterReportWriter(OUTPUT_DIR, total_files)
+    
+    def record(i, result):
+        writer.add(i + 1, result)
+        results[i] = {k: v for k, v in result.items() if k not in ("analysis", "calls")}
+    
+    for i in range(total_files):
+        if results[i] is not None:
+            record(i, results[i])
+    journaled.clear()
     
-    # Process files
-    results = []
     start_time = time.time()
+    done = 0
+    cache_hits = 0
     
-    for i, filepath in enumerate(files, 1):
-        filename = os.path.basename(filepath)
-        print(f"[{i}/{total_files}] Analyzing: {filename[:50]}...")
-        
+    # Longest files first: they take the longest, so starting them early
+    # keeps the run from ending on one big file while the other slots idle
+    pending.sort(key=lambda i: -sizes[i])
+    
+    interrupted = False
+    # File workers wait on their chunks, so chunks need a pool of their own
+    with run_metrics.stage("analysis"), ThreadPoolExecutor(max_workers=capacity) as pool, \
+            ThreadPoolExecutor(max_workers=capacity) as chunk_pool:
+        futures = {pool.submit(analyze_file, files[i], client, cache, chunk_pool, time.perf_counter()): i
+                   for i in pending}
         try:
-            result = analyze_file(filepath)
-            results.append(result)
-            
-            # Save individual analysis
-            save_individual_analysis(result, OUTPUT_DIR)
+            for future in as_completed(futures):
+                i = futures[future]
+                filename = os.path.basename(files[i])
+                done += 1
             
-            # Progress update
-            elapsed = (time.time() - start_time) / 60
-            avg_time = elapsed / i
-            remaining = avg_time * (total_files - i)
-            print(f"         ✅ Done. ETA: {remaining:.1f} min remaining")
-            
-        except Exception as e:
-            print(f"         ❌ Error: {e}")
-            results.append({"file": filepath, "analysis": f"[ERROR: {e}]"})
-        
-        # Small delay to avoid overwhelming Ollama
-        time.sleep(1)
+                try:
+                    result = future.result()
+                    cache_hits += result["cached"]
+                    for call in result["calls"]:
+                        run_metrics.record_call(call["phase"], result["file"], call["metrics"], call["cached"])
+                    run_metrics.record("file", result["file"], cached=result["cached"], parts=result["parts"],
+                                       calls=len(result["calls"]), bytes_read=sizes[i], queue_wait=result["queue_wait"],
+                                       latency=(result["metrics"] or {}).get("total"))
+                
+                    # Save individual analysis
+                    save_individual_analysis(result, OUTPUT_DIR)
+                    if not is_error(result["analysis"]):
+                        journal.append("file", index=i, file=result["file"], key=result["key"], keys=result["keys"],
+                                       content=result["content"], parts=result["parts"], cached=result["cached"],
+                                       analysis=result["analysis"], metrics=result["metrics"])
+                    record(i, result)
+                
+                    # Progress update
+                    elapsed = (time.time() - start_time) / 60
+                    rate = done / elapsed if elapsed > 0 else 0
+                    remaining = (len(pending) - done) / rate if rate else 0
+                    status = "♻️ cached" if result["cached"] else "✅"
+                    if result["parts"] > 1:
+                        status += f" 🧩 {result['parts']} parts"
+                    timing = f" | {format_metrics(result['metrics'])}" if result["metrics"] else ""
+                    if (client.concurrency() or 0) < client.capacity():
+                        timing += f" | ⚙️ throttled to {client.concurrency() or 0}/{client.capacity()}"
+                    print(f"[{done}/{len(pending)}] {status} {filename[:50]} | {rate:.1f} files/min | ETA: {remaining:.1f} min{timing}")
+                
+                except Exception as e:
+                    print(f"[{done}/{len(pending)}] ❌ {filename[:50]}: {e}")
+                    record(i, {"file": os.path.relpath(files[i], CORPUS_PATH), "analysis": f"[ERROR: {e}]", "metrics": None})
+    
+        except KeyboardInterrupt:
+            # Drop the queued files; the with-block still waits for calls already in flight
+            pool.shutdown(wait=False, cancel_futures=True)
+            chunk_pool.shutdown(wait=False, cancel_futures=True)
+            interrupted = True
+            running = sum(1 for f in futures if f.running())
+            print(f"\n🛑 Interrupted after {done}/{len(pending)} files; waiting for {running} in flight "
+                  "(Ctrl+C again to quit now).")
+    
+    if interrupted:
+        client.close()
+        writer.close()
+        journal.close()
+        print("Completed files are journaled; run again with --resume to continue.")
+        return
+    
+    client.close()
+    
+    # Drop cache entries for files that were deleted or have changed since.
+    # A filtered run only sees part of the corpus, so it leaves the cache alone.
+    if cache is not None and (args.include or args.exclude):
+        print("\nℹ️  --include/--exclude in use; cache not pruned.")
+    elif cache is not None:
+        live = {key for r in results for key in r.get("keys", ()) if key}
+        pruned = cache.prune(live)
+        if pruned:
+            print(f"\n🧹 Pruned {pruned} stale cache entries.")
+    
+    # Each skipped duplicate saved as many calls as its representative needed
+    calls_saved = sum((results[duplicate_of[i]].get("metrics") or {}).get("calls", 1) for i in skipped)
     
     # Create master report
     total_time = (time.time() - start_time) / 60
-    report_path = create_master_report(results, OUTPUT_DIR, total_time)
+    with run_metrics.stage("report"):
+        report_path = create_master_report(writer, results, total_time, capacity, calls_saved)
+        metrics_path = save_metrics(results, OUTPUT_DIR)
+    run_metrics_path = run_metrics.save(os.path.join(OUTPUT_DIR, "run_metrics.json"), top_phase="file")
+    with open(os.path.join(OUTPUT_DIR, "run_metrics.md"), 'w', encoding='utf-8') as f:
+        f.write(run_metrics.format_summary(top_phase="file"))
+    summary = summarize_metrics([r.get("metrics") for r in results])
+    journal.append("report", path=report_path, finished=datetime.now().isoformat())
+    journal.close()
     
     print("\n" + "=" * 60)
     print("✅ ANALYSIS COMPLETE!")
     print("=" * 60)
     print(f"Files Analyzed: {len(results)}")
+    print(f"Cache Hits: {cache_hits} (LLM calls skipped)")
+    if skipped:
+        print(f"Near-Duplicates Skipped: {len(skipped)} ({calls_saved} LLM calls saved)")
+    if restored:
+        print(f"Restored From Journal: {restored}")
     print(f"Total Time: {total_time:.1f} minutes")
+    if total_time > 0:
+        print(f"Throughput: {len(results) / total_time:.1f} files/min")
+    if summary["tokens_per_sec"]:
+        print(f"Generation Speed: {summary['tokens_per_sec']:.1f} tokens/sec over {summary['calls']} calls")
+    run_metrics.print_summary(top_phase="file")
     print(f"Master Report: {report_path}")
+    print(f"Generation Metrics: {metrics_path}")
+    print(f"Run Metrics: {run_metrics_path} (+ run_metrics.md)")
     print(f"Individual Analyses: {OUTPUT_DIR}")
     print("=" * 60)
 
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Nova Ollama Client
+==================
+Shared HTTP client for the Nova tools. One pooled requests.Session is kept
+for the whole run, so every file and batch reuses an open keep-alive
+connection instead of paying a fresh TCP handshake per prompt.
+
+Connection failures and transient server errors (429/5xx) are retried with
+exponential backoff. Failures are returned as the same "[ERROR: ...]" /
+"[OLLAMA ERROR: ...]" strings the tools have always written, so callers
+(and analysis_cache.is_error) need no new error handling.
+
+Concurrency adapts to the server (AIMD, as in TCP congestion control): the
+number of calls in flight grows by one per round of successful calls and is
+halved when Ollama shows it is overloaded (timeouts, 429/5xx, or a first
+token that takes longer than TTFT_TARGET because the request sat in
+Ollama's queue), and new calls are spaced out while it recovers. A call that
+times out is retried once with a shorter num_predict.
+
+Responses are streamed by default. Each call also returns a metrics dict:
+time-to-first-token, wall time, time spent waiting for a slot, response
+bytes, retries, and Ollama's eval_count / eval_duration (tokens/sec), for
+sizing hardware and comparing models.
+
+Author: Alpha (Antigravity)
+Date: December 2025
+"""
+
+import os
+import json
+import time
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ReadTimeoutError
+from urllib3.util.retry import Retry
+
+# ============= CONFIGURATION =============
+OLLAMA_HOST = os.environ.get("OLLAMA_HOST", "http://localhost:11434")
+
+CONNECT_TIMEOUT = 5      # seconds to establish a connection
+READ_TIMEOUT = 120       # seconds to wait for a reply (between tokens when streaming)
+RETRIES = 3              # attempts after the first for connect errors / 429 / 5xx
+BACKOFF_FACTOR = 1.0     # sleeps 1s, 2s, 4s, ... between retries
+
+TTFT_TARGET = 30         # a first token slower than this means requests are queueing
+MAX_SPACING = 8          # seconds; upper bound on the gap between call starts after overload
+TIMEOUT_RETRIES = 1      # re-sends of a timed-out prompt, each with num_predict halved
+MIN_PREDICT = 128        # num_predict is never shortened below this
+
+NOT_RUNNING = "[ERROR: Ollama not running. Start with 'ollama serve']"
+
+
+def timed_out(text):
+    return text.startswith("[ERROR: Ollama timed out")
+
+
+def _overloaded(text, metrics):
+    """True when a call's outcome says the server has more work than it can keep up with."""
+    if timed_out(text) or text.startswith("[ERROR: stream ended"):
+        return True
+    if text.startswith("[OLLAMA ERROR: ") and text[15:18] in ("429", "500", "502", "503", "504"):
+        return True
+    return (metrics.get("ttft") or 0) > TTFT_TARGET
+
+
+class AdaptiveLimiter:
+    """AIMD limit on calls in flight, between 1 and `ceiling`.
+
+    Each success adds 1/limit (so +1 per round of `limit` calls); an overload
+    halves the limit and doubles the spacing enforced between call starts.
+    Calls that were already in flight when the limit was cut don't cut it
+    again, so one burst of timeouts counts as one overload.
+    """
+
+    def __init__(self, ceiling):
+        self.ceiling = ceiling
+        self.limit = float(ceiling)
+        self.spacing = 0.0
+        self.in_flight = 0
+        self._next_start = 0.0
+        self._last_cut = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        """Wait for a free slot and the spacing; returns the call's start time for release()."""
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.spacing
+        if start > now:
+            time.sleep(start - now)
+        return start
+
+    def release(self, started, overloaded=False):
+        with self._cond:
+            self.in_flight -= 1
+            if not overloaded:
+                self.limit = min(self.ceiling, self.limit + 1 / self.limit)
+                self.spacing = self.spacing / 2 if self.spacing > 0.1 else 0.0
+            elif started >= self._last_cut:
+                self._last_cut = time.monotonic()
+                self.limit = max(1.0, self.limit / 2)
+                self.spacing = min(MAX_SPACING, max(1.0, self.spacing * 2))
+            self._cond.notify_all()
+
+
+class OllamaClient:
+    """Pooled, retrying client for Ollama's generate and embed APIs. Safe to share between threads."""
+
+    def __init__(self, host=OLLAMA_HOST, pool_size=10, retries=RETRIES,
+                 backoff_factor=BACKOFF_FACTOR, connect_timeout=CONNECT_TIMEOUT, max_in_flight=None):
+        if "://" not in host:
+            host = f"http://{host}"
+        self.host = host.rstrip("/")
+        self.connect_timeout = connect_timeout
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            # A read timeout means the model was busy generating; retrying it
+            # many times only multiplies the wait, so allow a single retry.
+            read=min(retries, 1),
+            status=retries,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=None,        # POST too: a generate call has no side effects
+            backoff_factor=backoff_factor,
+            raise_on_status=False,       # hand back the last response so its status is reported
+        )
+        # pool_maxsize must cover every thread that calls at once, otherwise
+        # urllib3 discards the extra connections instead of keeping them alive
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, pool_size), max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # Caps concurrent generations across every thread that shares this
+        # client (e.g. whole-file and per-chunk calls), whatever pool they run in
+        self.limiter = AdaptiveLimiter(max_in_flight) if max_in_flight else None
+
+    def concurrency(self):
+        """Calls currently allowed in flight (None when unlimited)."""
+        return int(self.limiter.limit) if self.limiter else None
+
+    def generate(self, prompt, model, options=None, timeout=READ_TIMEOUT, stream=True,
+                 partial_path=None, on_token=None, timeout_retries=TIMEOUT_RETRIES):
+        """Send a prompt. Returns (text, metrics); text is an "[ERROR ...]" string on failure.
+
+        With stream=True the NDJSON token stream is consumed as it arrives, so
+        timeout bounds the silence between tokens rather than the whole
+        generation. Tokens are appended to partial_path (if given) as they
+        come in, and passed to on_token(str) for live console output.
+
+        A timed-out prompt is sent again with num_predict halved, up to
+        timeout_retries times; metrics["num_predict"] then records the
+        shortened limit, so callers can avoid caching the shorter reply.
+        """
+        payload = {"model": model, "prompt": prompt, "stream": stream}
+        if options:
+            payload["options"] = dict(options)
+        retries = 0
+        elapsed = queue_wait = 0.0
+        while True:
+            metrics = {"model": model, "streamed": stream, "ttft": None}
+            text, metrics = self._limited(payload, metrics, timeout, stream, partial_path, on_token)
+            elapsed += metrics["total"]
+            queue_wait += metrics["queue_wait"]
+            predict = payload.get("options", {}).get("num_predict")
+            if not timed_out(text) or retries >= timeout_retries or not predict or predict <= MIN_PREDICT:
+                break
+            retries += 1
+            payload["options"]["num_predict"] = max(MIN_PREDICT, predict // 2)
+        # Totals over every attempt; ttft and the counters are the last attempt's
+        metrics["total"], metrics["queue_wait"], metrics["retries"] = elapsed, queue_wait, retries
+        if retries:
+            metrics["num_predict"] = payload["options"]["num_predict"]
+        return text, metrics
+
+    def _limited(self, payload, metrics, timeout, stream, partial_path, on_token):
+        metrics["queue_wait"] = 0.0
+        if self.limiter is None:
+            return self._generate(payload, metrics, timeout, stream, partial_path, on_token)
+        waiting = time.perf_counter()
+        started = self.limiter.acquire()
+        metrics["queue_wait"] = time.perf_counter() - waiting
+        try:
+            text, metrics = self._generate(payload, metrics, timeout, stream, partial_path, on_token)
+        except BaseException:
+            self.limiter.release(started)
+            raise
+        self.limiter.release(started, _overloaded(text, metrics))
+        return text, metrics
+
+    def _generate(self, payload, metrics, timeout, stream, partial_path, on_token):
+        started = time.perf_counter()
+        try:
+            with self.session.post(f"{self.host}/api/generate", json=payload, stream=stream,
+                                   timeout=(self.connect_timeout, timeout)) as response:
+                history = getattr(getattr(response.raw, "retries", None), "history", None)
+                metrics["http_retries"] = len(history) if history else 0
+                if response.status_code != 200:
+                    return f"[OLLAMA ERROR: {response.status_code}]", _finish(metrics, started)
+                if not stream:
+                    metrics["bytes"] = len(response.content)
+                    final = response.json()
+                    return final.get("response", "[NO RESPONSE]"), _finish(metrics, started, final)
+                return self._read_stream(response, metrics, started, partial_path, on_token)
+        except requests.exceptions.ConnectTimeout:
+            text = NOT_RUNNING
+        except requests.exceptions.Timeout:
+            text = f"[ERROR: Ollama timed out after {timeout}s]"
+        except requests.exceptions.ConnectionError as e:
+            # Once retries are used up (or mid-stream), requests reports a read
+            # timeout as a ConnectionError; don't tell the user the server is down
+            arg = e.args[0] if e.args else None
+            if isinstance(getattr(arg, "reason", arg), ReadTimeoutError):
+                text = f"[ERROR: Ollama timed out after {timeout}s]"
+            else:
+                text = NOT_RUNNING
+        except Exception as e:
+            text = f"[ERROR: {e}]"
+        return text, _finish(metrics, started)
+
+    def _read_stream(self, response, metrics, started, partial_path, on_token):
+        parts = []
+        final = {}
+        partial = open(partial_path, 'w', encoding='utf-8') if partial_path else None
+        metrics["bytes"] = 0
+        try:
+            for line in response.iter_lines():
+                metrics["bytes"] += len(line) + 1
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if "error" in chunk:
+                    return f"[OLLAMA ERROR: {chunk['error']}]", _finish(metrics, started)
+                token = chunk.get("response", "")
+                if token:
+                    if metrics["ttft"] is None:
+                        metrics["ttft"] = time.perf_counter() - started
+                    parts.append(token)
+                    if partial is not None:
+                        partial.write(token)
+                        partial.flush()
+                    if on_token is not None:
+                        on_token(token)
+                if chunk.get("done"):
+                    # No break: reading on to the end of the body lets the
+                    # connection go back to the pool instead of being dropped
+                    final = chunk
+        finally:
+            if partial is not None:
+                partial.close()
+        if not final:
+            # Stream ended without a done message: keep the .partial file for inspection
+            return "[ERROR: stream ended before the response was complete]", _finish(metrics, started)
+        if partial_path:
+            os.remove(partial_path)
+        return "".join(parts) or "[NO RESPONSE]", _finish(metrics, started, final)
+
+    def embed(self, texts, model, timeout=READ_TIMEOUT):
+        """Embedding vectors for a list of texts, or None if the server cannot provide them.
+
+        Uses the batched /api/embed endpoint, falling back to one
+        /api/embeddings call per text on Ollama versions that predate it.
+        """
+        started = self.limiter.acquire() if self.limiter else None
+        overloaded = False
+        try:
+            return self._embed(texts, model, timeout)
+        except requests.exceptions.Timeout:
+            overloaded = True
+            return None
+        except (requests.exceptions.RequestException, ValueError, KeyError):
+            return None
+        finally:
+            if self.limiter:
+                self.limiter.release(started, overloaded)
+
+    def _embed(self, texts, model, timeout):
+        timeouts = (self.connect_timeout, timeout)
+        response = self.session.post(f"{self.host}/api/embed", json={"model": model, "input": texts},
+                                     timeout=timeouts)
+        if response.status_code == 200:
+            return response.json()["embeddings"]
+        if response.status_code != 404:
+            return None
+        vectors = []
+        for text in texts:
+            response = self.session.post(f"{self.host}/api/embeddings", json={"model": model, "prompt": text},
+                                         timeout=timeouts)
+            if response.status_code != 200:
+                return None
+            vectors.append(response.json()["embedding"])
+        return vectors
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _finish(metrics, started, final=None):
+    """Fill in wall time and Ollama's own counters (durations come back in ns)."""
+    metrics["total"] = time.perf_counter() - started
+    final = final or {}
+    for field in ("eval_count", "prompt_eval_count"):
+        metrics[field] = final.get(field)
+    for field in ("eval_duration", "prompt_eval_duration", "load_duration"):
+        metrics[field] = final[field] / 1e9 if final.get(field) is not None else None
+    if metrics["eval_count"] and metrics["eval_duration"]:
+        metrics["tokens_per_sec"] = metrics["eval_count"] / metrics["eval_duration"]
+    else:
+        metrics["tokens_per_sec"] = None
+    return metrics
+
+
+def summarize_metrics(calls):
+    """Aggregate metrics dicts: totals and means over calls that reported them.
+
+    A dict may stand for several calls (its "calls" field), e.g. a chunked file.
+    """
+    calls = [m for m in calls if m]
+    def mean(field):
+        values = [m[field] for m in calls if m.get(field) is not None]
+        return sum(values) / len(values) if values else None
+    eval_count = sum(m.get("eval_count") or 0 for m in calls)
+    eval_duration = sum(m.get("eval_duration") or 0 for m in calls)
+    return {
+        "calls": sum(m.get("calls", 1) for m in calls),
+        "eval_count": eval_count,
+        "eval_duration": eval_duration,
+        "tokens_per_sec": eval_count / eval_duration if eval_duration else None,
+        "mean_ttft": mean("ttft"),
+        "mean_total": mean("total"),
+    }
+
+
+def format_metrics(metrics):
+    """One-line summary of a call's metrics, e.g. 'TTFT 0.4s | 812 tok | 31.2 tok/s'."""
+    parts = []
+    if metrics.get("calls", 1) > 1:
+        parts.append(f"{metrics['calls']} calls")
+    if metrics.get("ttft") is not None:
+        parts.append(f"TTFT {metrics['ttft']:.1f}s")
+    if metrics.get("eval_count"):
+        parts.append(f"{metrics['eval_count']} tok")
+    if metrics.get("tokens_per_sec"):
+        parts.append(f"{metrics['tokens_per_sec']:.1f} tok/s")
+    return " | ".join(parts)
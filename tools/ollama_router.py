@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Nova Ollama Router
+==================
+Spreads the tools' model calls over several Ollama servers (other machines,
+or several `ollama serve` instances on different ports), so a second
+workstation's GPU does its share of an overnight run.
+
+Each backend gets its own pooled, adaptively throttled OllamaClient. A call
+goes to the healthy backend with the fewest outstanding requests relative
+to its current concurrency limit, among those that have the requested model
+pulled. A background health check polls /api/tags, which also tells the
+router which models each backend serves; a backend that refuses
+connections and then fails a re-check is taken out of rotation until it
+answers again, and its call is retried on another backend. When no backend
+is left (e.g. the only server is restarting), calls wait for one to come
+back instead of failing the rest of the run.
+
+OllamaRouter has the same generate/embed interface as OllamaClient, so the
+tools use it with one host or many.
+
+Author: Alpha (Antigravity)
+Date: December 2025
+"""
+
+import os
+import time
+import threading
+import requests
+
+from ollama_client import CONNECT_TIMEOUT, NOT_RUNNING, OLLAMA_HOST, OllamaClient
+
+# ============= CONFIGURATION =============
+# Comma-separated list of servers; falls back to the single OLLAMA_HOST
+OLLAMA_HOSTS = [h.strip() for h in os.environ.get("OLLAMA_HOSTS", OLLAMA_HOST).split(",") if h.strip()]
+HEALTH_INTERVAL = 30     # seconds between health checks
+RECOVERY_WAIT = 120      # seconds a call waits for a backend to come back before failing
+RECOVERY_POLL = 5        # seconds between re-checks while waiting
+
+
+def model_tag(name):
+    """Ollama's full model name: "llama3" and "llama3:latest" are the same model."""
+    return name if ":" in name else f"{name}:latest"
+
+
+class Backend:
+    def __init__(self, client):
+        self.client = client
+        self.healthy = False
+        self.models = set()
+        self.outstanding = 0
+
+    def load(self):
+        return self.outstanding / (self.client.concurrency() or 1)
+
+
+class OllamaRouter:
+    """Least-outstanding-requests load balancer over one OllamaClient per host. Safe to share between threads."""
+
+    def __init__(self, hosts=None, pool_size=10, max_in_flight=None, health_interval=HEALTH_INTERVAL, **client_args):
+        hosts = hosts or OLLAMA_HOSTS
+        self.backends = [Backend(OllamaClient(host, pool_size=pool_size, max_in_flight=max_in_flight, **client_args))
+                         for host in hosts]
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._ever_healthy = False
+        self.check_health()
+        self._checker = threading.Thread(target=self._health_loop, args=(health_interval,), daemon=True)
+        self._checker.start()
+
+    def check_health(self):
+        """Poll every backend's /api/tags, updating its health and model list."""
+        for backend in self.backends:
+            self._check(backend)
+
+    def _check(self, backend):
+        try:
+            response = backend.client.session.get(f"{backend.client.host}/api/tags",
+                                                  timeout=(CONNECT_TIMEOUT, CONNECT_TIMEOUT))
+            response.raise_for_status()
+            models = {model_tag(m["name"]) for m in response.json().get("models", [])}
+            healthy = True
+        except (requests.exceptions.RequestException, ValueError, KeyError):
+            models, healthy = backend.models, False
+        with self._lock:
+            backend.healthy, backend.models = healthy, models
+            self._ever_healthy = self._ever_healthy or healthy
+        return healthy
+
+    def _health_loop(self, interval):
+        while not self._stop.wait(interval):
+            self.check_health()
+
+    def status(self):
+        """[(host, healthy, sorted model names)] for display."""
+        return [(b.client.host, b.healthy, sorted(b.models)) for b in self.backends]
+
+    def has_model(self, model):
+        return any(b.healthy and model_tag(model) in b.models for b in self.backends)
+
+    def concurrency(self):
+        """Calls allowed in flight across all healthy backends."""
+        return sum(b.client.concurrency() or 1 for b in self.backends if b.healthy) or None
+
+    def capacity(self):
+        """Calls the healthy backends would allow in flight if none were throttled."""
+        return sum(b.client.limiter.ceiling if b.client.limiter else 1 for b in self.backends if b.healthy)
+
+    def _acquire(self, model, tried):
+        """The least-loaded healthy backend serving model (any healthy one if none lists it)."""
+        with self._lock:
+            candidates = [b for b in self.backends if b.healthy and b not in tried]
+            serving = [b for b in candidates if model is None or model_tag(model) in b.models]
+            if not (serving or candidates):
+                return None
+            backend = min(serving or candidates, key=Backend.load)
+            backend.outstanding += 1
+            return backend
+
+    def _release(self, backend):
+        with self._lock:
+            backend.outstanding -= 1
+
+    def _wait_for_backend(self, deadline):
+        """Re-check every backend until one answers; False once the deadline passes.
+
+        Does not wait if no backend was ever reachable: that is a setup
+        problem, not a server restarting mid-run.
+        """
+        while self._ever_healthy and time.monotonic() < deadline:
+            if self._stop.wait(RECOVERY_POLL):
+                break
+            self.check_health()
+            if any(b.healthy for b in self.backends):
+                return True
+        return False
+
+    def generate(self, prompt, model, options=None, **kwargs):
+        """OllamaClient.generate on the least-loaded backend; metrics["host"] says which one answered."""
+        tried = []
+        deadline = None
+        while True:
+            backend = self._acquire(model, tried)
+            if backend is None:
+                deadline = deadline or time.monotonic() + RECOVERY_WAIT
+                if not self._wait_for_backend(deadline):
+                    return NOT_RUNNING, {"model": model, "ttft": None, "total": 0, "host": None}
+                tried = []
+                continue
+            try:
+                text, metrics = backend.client.generate(prompt, model, options, **kwargs)
+            finally:
+                self._release(backend)
+            if text != NOT_RUNNING:
+                metrics["host"] = backend.client.host
+                return text, metrics
+            # Connection refused: a backend that also fails a re-check leaves
+            # rotation; either way the call moves on to another backend
+            self._check(backend)
+            tried.append(backend)
+
+    def embed(self, texts, model, **kwargs):
+        backend = self._acquire(model, [])
+        if backend is None:
+            return None
+        try:
+            return backend.client.embed(texts, model, **kwargs)
+        finally:
+            self._release(backend)
+
+    def close(self):
+        self._stop.set()
+        for backend in self.backends:
+            backend.client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Nova Run Journal
+================
+Append-only JSONL record of completed work for the Nova tools. Each finished
+file or batch is written (and fsynced) the moment it completes, so a crash
+loses at most the requests that were in flight. A later run started with
+--resume reads the journal back and only does the missing work.
+
+The first line is a header describing the run (model, prompt hash, ...).
+A resume is refused if that header no longer matches the current settings,
+because the journaled results would not be what this run would produce.
+
+Author: Alpha (Antigravity)
+Date: December 2025
+"""
+
+import os
+import json
+import threading
+from datetime import datetime
+
+
+class RunJournal:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+
+    def read(self):
+        """(header, [records]) from an existing journal; (None, []) if there is none.
+
+        A torn final line from a crash mid-write is ignored.
+        """
+        header, records = None, []
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        continue
+                    if rec.get("type") == "run":
+                        header = rec
+                    else:
+                        records.append(rec)
+        except OSError:
+            pass
+        return header, records
+
+    def open(self, run_info, resume=False):
+        """Start writing. Returns journaled records to reuse (empty unless resuming a matching run)."""
+        records = []
+        if resume:
+            header, old = self.read()
+            if header is None:
+                print("⚠️  No journal found; starting a fresh run.")
+            elif any(header.get(k) != v for k, v in run_info.items()):
+                print("⚠️  Journal was written with different settings; starting a fresh run.")
+            else:
+                records = old
+        if records:
+            self._trim_torn_line()
+            self._file = open(self.path, 'a', encoding='utf-8')
+        else:
+            self._file = open(self.path, 'w', encoding='utf-8')
+            self._write(dict(run_info, type="run", started=datetime.now().isoformat()))
+        return records
+
+    def _trim_torn_line(self):
+        """Cut a final line left without its newline by a crash, so appends start on a line of their own."""
+        with open(self.path, 'rb+') as f:
+            end = pos = f.seek(0, os.SEEK_END)
+            # Scan back from the end in blocks; the journal can be large
+            while pos > 0:
+                start = max(0, pos - 65536)
+                f.seek(start)
+                block = f.read(pos - start)
+                if pos == end and block.endswith(b"\n"):
+                    return
+                newline = block.rfind(b"\n")
+                if newline >= 0:
+                    f.truncate(start + newline + 1)
+                    return
+                pos = start
+
+    def _write(self, record):
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def append(self, record_type, **fields):
+        with self._lock:
+            self._write(dict(fields, type=record_type))
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Nova Run Metrics
+================
+Structured instrumentation for the Nova tools: one record per model call
+(latency, time queued for a slot, TTFT, prompt/response tokens, bytes,
+cache hit, retries) and per processed item (file or batch), plus wall time
+per stage of the run.
+
+Records are grouped by phase (e.g. "analyze", "chunk", "merge", "level 1")
+and summarized with p50/p95/p99 percentiles and a latency histogram per
+phase, to show which files and batches dominate a run. Everything is saved
+as JSON for scripts, and as a markdown summary for reading.
+
+Author: Alpha (Antigravity)
+Date: December 2025
+"""
+
+import json
+import time
+import threading
+from contextlib import contextmanager
+
+# ============= CONFIGURATION =============
+PERCENTILES = (50, 95, 99)
+FIELDS = ("latency", "queue_wait", "ttft", "prompt_tokens", "response_tokens", "bytes_read", "response_bytes")
+LATENCY_BUCKETS = (0.5, 1, 2, 5, 10, 30, 60, 120, 300)   # histogram upper bounds, seconds
+HISTOGRAM_WIDTH = 30
+
+
+def percentile(values, p):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(0, -(-len(ordered) * p // 100) - 1)]
+
+
+def histogram(values, bounds=LATENCY_BUCKETS):
+    """[(label, count)] of values per bucket, up to the last non-empty bucket."""
+    counts = [0] * (len(bounds) + 1)
+    for v in values:
+        counts[next((n for n, b in enumerate(bounds) if v < b), len(bounds))] += 1
+    labels = [f"<{bounds[0]}s"] + [f"{a}-{b}s" for a, b in zip(bounds, bounds[1:])] + [f">={bounds[-1]}s"]
+    last = max((n for n, c in enumerate(counts) if c), default=-1)
+    return list(zip(labels, counts))[:last + 1]
+
+
+class RunMetrics:
+    """Collects records from any thread; summarizes and saves them at the end of a run."""
+
+    def __init__(self, tool):
+        self.tool = tool
+        self.records = []
+        self.stages = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name):
+        """Time a stage of the run (discovery, analysis, report, ...)."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0) + time.perf_counter() - started
+
+    def record(self, phase, item, **fields):
+        with self._lock:
+            self.records.append({"phase": phase, "item": item, **fields})
+
+    def record_call(self, phase, item, metrics, cached=False, **fields):
+        """Add one model call from its client metrics dict (None for a cache hit)."""
+        m = metrics or {}
+        self.record(phase, item, cached=cached, model=m.get("model"), host=m.get("host"),
+                    latency=m.get("total"), queue_wait=m.get("queue_wait"), ttft=m.get("ttft"),
+                    prompt_tokens=m.get("prompt_eval_count"), response_tokens=m.get("eval_count"),
+                    response_bytes=m.get("bytes"), retries=(m.get("retries") or 0) + (m.get("http_retries") or 0),
+                    **fields)
+
+    def summary(self):
+        """Per phase: counts, totals, and percentiles of every numeric field."""
+        phases = {}
+        for rec in self.records:
+            phases.setdefault(rec["phase"], []).append(rec)
+        summary = {}
+        for phase, recs in phases.items():
+            stats = {"count": len(recs),
+                     "cache_hits": sum(1 for r in recs if r.get("cached")),
+                     "retries": sum(r.get("retries") or 0 for r in recs),
+                     "totals": {}, "percentiles": {}}
+            for field in FIELDS:
+                values = [r[field] for r in recs if r.get(field) is not None]
+                if values:
+                    stats["totals"][field] = sum(values)
+                    stats["percentiles"][field] = {f"p{p}": percentile(values, p) for p in PERCENTILES}
+                    stats["percentiles"][field]["max"] = max(values)
+            latencies = [r["latency"] for r in recs if r.get("latency") is not None]
+            stats["latency_histogram"] = histogram(latencies)
+            summary[phase] = stats
+        return summary
+
+    def slowest(self, phase, n=10):
+        """The n records of a phase with the highest latency."""
+        recs = [r for r in self.records if r["phase"] == phase and r.get("latency") is not None]
+        return sorted(recs, key=lambda r: -r["latency"])[:n]
+
+    def save(self, path, top_phase=None):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"tool": self.tool, "stages": self.stages, "phases": self.summary(),
+                       "slowest": self.slowest(top_phase) if top_phase else [],
+                       "records": self.records}, f, indent=2)
+        return path
+
+    def format_summary(self, top_phase=None, top=10):
+        """Markdown: stage times, a percentile table and histogram per phase, and the slowest items."""
+        lines = [f"# ⏱️ {self.tool} Run Metrics", "", "## Stages", "", "| Stage | Wall time |", "|---|---|"]
+        lines += [f"| {name} | {seconds:.1f}s |" for name, seconds in self.stages.items()]
+        for phase, stats in self.summary().items():
+            lines += ["", f"## {phase}", "",
+                      f"{stats['count']} records, {stats['cache_hits']} cache hits, {stats['retries']} retries", "",
+                      "| Metric | " + " | ".join(f"p{p}" for p in PERCENTILES) + " | max | total |",
+                      "|---|" + "---|" * (len(PERCENTILES) + 2)]
+            for field, pct in stats["percentiles"].items():
+                cells = [_fmt(pct[f"p{p}"]) for p in PERCENTILES] + [_fmt(pct["max"]), _fmt(stats["totals"][field])]
+                lines.append(f"| {field} | " + " | ".join(cells) + " |")
+            if stats["latency_histogram"]:
+                peak = max(count for _, count in stats["latency_histogram"])
+                lines += ["", "```"]
+                lines += [f"{label:>10} {'█' * round(HISTOGRAM_WIDTH * count / peak) if peak else ''} {count}"
+                          for label, count in stats["latency_histogram"]]
+                lines.append("```")
+        if top_phase:
+            lines += ["", f"## Slowest ({top_phase})", "", "| Item | Latency | Queue wait |", "|---|---|---|"]
+            lines += [f"| {r['item']} | {r['latency']:.1f}s | {_fmt(r.get('queue_wait'))} |"
+                      for r in self.slowest(top_phase, top)]
+        return "\n".join(lines) + "\n"
+
+    def print_summary(self, top_phase=None, top=5):
+        """Compact console version: one line per phase, then the slowest items."""
+        for phase, stats in self.summary().items():
+            line = f"   {phase}: {stats['count']}"
+            if stats["cache_hits"]:
+                line += f" ({stats['cache_hits']} cached)"
+            latency = stats["percentiles"].get("latency")
+            if latency is not None:
+                line += f" | latency p50 {latency['p50']:.1f}s p95 {latency['p95']:.1f}s p99 {latency['p99']:.1f}s"
+            queue = stats["percentiles"].get("queue_wait", {}).get("p95")
+            if queue is not None:
+                line += f" | queue p95 {queue:.1f}s"
+            print(line)
+        if top_phase:
+            for r in self.slowest(top_phase, top):
+                print(f"   🐢 {r['latency']:.1f}s {r['item']}")
+
+
+def _fmt(value):
+    if value is None:
+        return "-"
+    return f"{value:.2f}" if isinstance(value, float) else str(value)
@@ -0,0 +1,182 @@
+import os
+import math
+import sqlite3
+import argparse
+import datetime
+
+from ingest import ingest
+from session_table import get_timezone
+
+DEFAULT_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'usage_ledger.sqlite')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    uuid TEXT PRIMARY KEY,
+    created_at REAL,
+    updated_at REAL,
+    duration REAL,
+    status TEXT,
+    replica_uuid TEXT,
+    persona_uuid TEXT
+);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS daily (day TEXT PRIMARY KEY, sessions INTEGER, seconds REAL);
+CREATE TABLE IF NOT EXISTS by_persona (persona_uuid TEXT PRIMARY KEY, sessions INTEGER, seconds REAL);
+CREATE TABLE IF NOT EXISTS by_replica (replica_uuid TEXT PRIMARY KEY, sessions INTEGER, seconds REAL);
+CREATE TABLE IF NOT EXISTS by_status (status TEXT PRIMARY KEY, sessions INTEGER, seconds REAL);
+"""
+
+# Aggregate table -> the session field it is keyed by
+AGGREGATES = {'daily': 'day', 'by_persona': 'persona_uuid',
+              'by_replica': 'replica_uuid', 'by_status': 'status'}
+
+
+def connect(db_path=DEFAULT_DB):
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def get_meta(conn, key, default=None):
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row['value'] if row else default
+
+
+def set_meta(conn, key, value):
+    conn.execute("INSERT INTO meta (key, value) VALUES (?, ?) "
+                 "ON CONFLICT(key) DO UPDATE SET value = excluded.value", (key, str(value)))
+
+
+def ledger_timezone(conn, tz_name):
+    """The ledger's day boundaries are fixed when it is created; reusing it with another tz is an error."""
+    stored = get_meta(conn, 'tz')
+    if stored is None:
+        stored = tz_name or 'UTC'
+        set_meta(conn, 'tz', stored)
+    elif tz_name and tz_name != stored:
+        raise ValueError(f"Ledger was built with --tz {stored}; rebuild it to change timezone")
+    return get_timezone(stored)
+
+
+def _day(ts, tz):
+    if ts is None or math.isnan(ts):
+        return "?"
+    return datetime.datetime.fromtimestamp(ts, tz).date().isoformat()
+
+
+def _apply(conn, session, sign, tz):
+    """Add (sign=1) or remove (sign=-1) one session's contribution to every aggregate."""
+    keys = dict(session)
+    keys['day'] = _day(session['created_at'], tz)
+    for table, field in AGGREGATES.items():
+        conn.execute(
+            f"INSERT INTO {table} ({field}, sessions, seconds) VALUES (?, ?, ?) "
+            f"ON CONFLICT({field}) DO UPDATE SET sessions = sessions + excluded.sessions, "
+            f"seconds = seconds + excluded.seconds",
+            (keys[field], sign, sign * session['duration']))
+
+
+def update(conn, table, tz):
+    """Fold new or changed sessions into the ledger. Returns (new, changed, untimed).
+
+    Rows with updated_at at or past the stored high-water mark are found by
+    bisection on the table's sorted updated_at index. Sessions the ledger has
+    never seen are folded in whatever their updated_at, since exports from
+    other workspaces can lag behind the mark. untimed counts rows without a
+    usable updated_at that could not be compared against a stored copy.
+    """
+    hwm = float(get_meta(conn, 'hwm', '-inf'))
+    known = {row['uuid'] for row in conn.execute("SELECT uuid FROM sessions")}
+    visit = set(table.index('updated_at').positions(hwm, None))
+    # The index leaves out rows without updated_at; visit those too so they are counted
+    visit.update(i for i, (uuid, ts) in enumerate(zip(table.uuid, table.updated_at))
+                 if uuid and (uuid not in known or math.isnan(ts)))
+    new = changed = untimed = 0
+    with conn:
+        for i in sorted(visit):
+            r = table.row(i)
+            if not r['uuid']:
+                continue
+            timed = not math.isnan(r['updated_at'])
+            old = conn.execute("SELECT * FROM sessions WHERE uuid = ?", (r['uuid'],)).fetchone()
+            if old is not None:
+                if not timed:
+                    untimed += 1
+                    continue
+                # A copy stored without updated_at is older than any timed one
+                if old['updated_at'] is not None and old['updated_at'] >= r['updated_at']:
+                    continue
+                _apply(conn, old, -1, tz)
+                changed += 1
+            else:
+                new += 1
+            conn.execute(
+                "INSERT INTO sessions (uuid, created_at, updated_at, duration, status, replica_uuid, persona_uuid) "
+                "VALUES (:uuid, :created_at, :updated_at, :duration, :status, :replica_uuid, :persona_uuid) "
+                "ON CONFLICT(uuid) DO UPDATE SET created_at = excluded.created_at, "
+                "updated_at = excluded.updated_at, duration = excluded.duration, status = excluded.status, "
+                "replica_uuid = excluded.replica_uuid, persona_uuid = excluded.persona_uuid", r)
+            _apply(conn, r, 1, tz)
+            if timed:
+                hwm = max(hwm, r['updated_at'])
+        set_meta(conn, 'hwm', hwm)
+        set_meta(conn, 'last_run', datetime.datetime.now(datetime.timezone.utc).isoformat())
+    return new, changed, untimed
+
+
+def report(conn, by='daily', date_from=None, date_to=None):
+    field = AGGREGATES[by]
+    query = f"SELECT {field} AS key, sessions, seconds FROM {by} WHERE sessions != 0"
+    params = []
+    if by == 'daily':
+        if date_from:
+            query += " AND day >= ?"
+            params.append(date_from[:10])
+        if date_to:
+            query += " AND day <= ?"
+            params.append(date_to[:10])
+        query += " ORDER BY day"
+    else:
+        query += " ORDER BY seconds DESC"
+
+    total_sessions = total_seconds = 0
+    print(f"{field.upper():<40} | {'Sessions':>8} | {'Minutes':>10}")
+    print("-" * 66)
+    for row in conn.execute(query, params):
+        print(f"{row['key'] or '?':<40} | {row['sessions']:>8} | {row['seconds']/60:>10.1f}")
+        total_sessions += row['sessions']
+        total_seconds += row['seconds']
+    print("-" * 66)
+    print(f"{'TOTAL':<40} | {total_sessions:>8} | {total_seconds/60:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Append-only usage ledger updated incrementally from daily exports.")
+    parser.add_argument("--db", default=DEFAULT_DB, help="SQLite ledger file")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_update = sub.add_parser("update", help="Ingest new/changed sessions from exports")
+    p_update.add_argument("paths", nargs="+", help="xlsx/csv exports, directories or glob patterns")
+    p_update.add_argument("--tz", help="Timezone for daily buckets (fixed at ledger creation, default UTC)")
+    p_update.add_argument("--workers", type=int, help="Worker processes for multi-file ingestion")
+
+    p_report = sub.add_parser("report", help="Print precomputed aggregates")
+    p_report.add_argument("--by", choices=sorted(AGGREGATES), default="daily")
+    p_report.add_argument("--from", dest="date_from", help="First day (daily report only)")
+    p_report.add_argument("--to", dest="date_to", help="Last day, inclusive (daily report only)")
+
+    args = parser.parse_args()
+    conn = connect(args.db)
+    if args.command == "update":
+        with conn:
+            tz = ledger_timezone(conn, args.tz)
+        new, changed, untimed = update(conn, ingest(args.paths, args.workers, verbose=False), tz)
+        print(f"New sessions: {new}")
+        print(f"Changed sessions: {changed}")
+        if untimed:
+            print(f"Skipped {untimed} already-ledgered sessions without updated_at")
+        print(f"High-water mark: {get_meta(conn, 'hwm')}")
+    else:
+        report(conn, args.by, args.date_from, args.date_to)
+    conn.close()
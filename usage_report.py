@@ -0,0 +1,52 @@
+import argparse
+
+from ingest import ingest
+from session_table import CATEGORY_COLUMNS, add_range_args, resolve_range, format_timestamp
+
+def report(table, start=None, end=None, tz=None, period=None, by=None, list_sessions=False):
+    index = table.index()
+    if not len(index.keys):
+        print("No sessions with a created_at timestamp.")
+        return
+
+    # Open-ended ranges fall back to the first/last session in the export
+    lo = start if start is not None else index.keys[0]
+    hi = end if end is not None else index.keys[-1] + 1
+
+    count = index.count(lo, hi)
+    seconds = index.duration(lo, hi)
+    print(f"Range: {format_timestamp(lo, tz)} -> {format_timestamp(hi, tz)}")
+    print(f"Sessions: {count}")
+    print(f"Total Duration: {seconds:.1f} seconds ({seconds/60:.1f} minutes)")
+
+    if period:
+        print(f"\n--- BY {period.upper()} ---")
+        for bucket, n, secs in index.rollup(lo, hi, period, tz):
+            label = format_timestamp(bucket, tz)[:7 if period == 'month' else 10]
+            print(f"{label:<10} | {n:>6} sessions | {secs/60:>10.1f} min")
+
+    if by or list_sessions:
+        sessions = table.between(lo, hi)
+        if by:
+            counts = sessions.count_by(by)
+            durations = sessions.duration_by(by)
+            print(f"\n--- BY {by.upper()} ---")
+            for value in sorted(durations, key=durations.get, reverse=True):
+                print(f"{value or '?':<40} | {counts[value]:>6} | {durations[value]/60:>10.1f} min")
+        if list_sessions:
+            print("\n--- SESSIONS ---")
+            for i in range(len(sessions)):
+                r = sessions.row(i)
+                print(f"{r['uuid']:<20} | {r['status']:<10} | {format_timestamp(r['created_at'], tz)[:25]:<25} | {r['duration']/60:>8.1f} min")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Usage totals and rollups for any date range of a Tavus export.")
+    parser.add_argument("paths", nargs="+", help="xlsx/csv exports, directories or glob patterns (all sheets are read)")
+    add_range_args(parser)
+    parser.add_argument("--period", choices=("day", "month"), help="Roll up totals per calendar day/month")
+    parser.add_argument("--by", choices=CATEGORY_COLUMNS, help="Break totals down by a category column")
+    parser.add_argument("--sessions", action="store_true", help="List every session in the range")
+    parser.add_argument("--workers", type=int, help="Worker processes for multi-file ingestion")
+    args = parser.parse_args()
+    start, end, tz = resolve_range(args)
+    report(ingest(args.paths, args.workers, verbose=False), start, end, tz, args.period, args.by, args.sessions)
@@ -0,0 +1,154 @@
+import array
+import zipfile
+import xml.etree.ElementTree as ET
+
+NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+SHARED_STRINGS = 'xl/sharedStrings.xml'
+SHEET1 = 'xl/worksheets/sheet1.xml'
+WORKBOOK = 'xl/workbook.xml'
+WORKBOOK_RELS = 'xl/_rels/workbook.xml.rels'
+REL_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+PKG_REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+
+def column_index(ref):
+    """Convert a cell reference like 'AB12' into a zero-based column index."""
+    n = 0
+    for ch in ref:
+        if not ch.isalpha():
+            break
+        n = n * 26 + (ord(ch.upper()) - 64)
+    return n - 1
+
+
+class SharedStrings:
+    """Shared-string table stored as one string buffer plus an offset array.
+
+    Lookup by index is O(1) and the table costs a few bytes per entry instead
+    of a full Python object per string.
+    """
+
+    def __init__(self, buffer="", offsets=None):
+        self.buffer = buffer
+        self.offsets = offsets if offsets is not None else array.array('q', [0])
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if i < 0 or i >= len(self.offsets) - 1:
+            raise IndexError(i)
+        return self.buffer[self.offsets[i]:self.offsets[i + 1]]
+
+
+def si_text(si):
+    """Text of one <si>: plain <t>, or every rich-text run <r><t> concatenated.
+
+    Phonetic hints (<rPh>) are not part of the cell value and are skipped.
+    """
+    parts = []
+    for child in si:
+        if child.tag == NS + 't':
+            parts.append(child.text or "")
+        elif child.tag == NS + 'r':
+            t = child.find(NS + 't')
+            if t is not None:
+                parts.append(t.text or "")
+    return "".join(parts)
+
+
+def read_shared_strings(z):
+    """Stream xl/sharedStrings.xml into a SharedStrings table, clearing each <si> once read."""
+    if SHARED_STRINGS not in z.namelist():
+        return SharedStrings()
+    chunks = []
+    offsets = array.array('q', [0])
+    total = 0
+    with z.open(SHARED_STRINGS) as f:
+        root = None
+        for event, elem in ET.iterparse(f, events=('start', 'end')):
+            if event == 'start':
+                if root is None:
+                    root = elem
+                continue
+            if elem.tag == NS + 'si':
+                text = si_text(elem)
+                chunks.append(text)
+                total += len(text)
+                offsets.append(total)
+                root.clear()
+    return SharedStrings("".join(chunks), offsets)
+
+
+def list_sheets(file_path):
+    """Return [(sheet_name, part_path)] for every worksheet, in workbook order."""
+    with zipfile.ZipFile(file_path, 'r') as z:
+        names = z.namelist()
+        if WORKBOOK in names and WORKBOOK_RELS in names:
+            with z.open(WORKBOOK_RELS) as f:
+                targets = {rel.get('Id'): rel.get('Target')
+                           for rel in ET.parse(f).getroot().iter(PKG_REL_NS + 'Relationship')}
+            sheets = []
+            with z.open(WORKBOOK) as f:
+                for sheet in ET.parse(f).getroot().iter(NS + 'sheet'):
+                    target = targets.get(sheet.get(REL_NS + 'id'), '')
+                    part = target.lstrip('/') if target.startswith('/') else 'xl/' + target
+                    if part in names:
+                        sheets.append((sheet.get('name'), part))
+            if sheets:
+                return sheets
+        # No usable workbook metadata: fall back to the worksheet parts themselves
+        parts = sorted((n for n in names if n.startswith('xl/worksheets/sheet') and n.endswith('.xml')),
+                       key=lambda n: (len(n), n))
+        return [(n.rsplit('/', 1)[1][:-4], n) for n in parts]
+
+
+def _cell_value(c, strings):
+    t = c.get('t')
+    if t == 'inlineStr':
+        is_ = c.find(NS + 'is')
+        return si_text(is_) if is_ is not None else ""
+    v = c.find(NS + 'v')
+    if v is None or v.text is None:
+        return ""
+    if t == 's':
+        try:
+            return strings[int(v.text)]
+        except (ValueError, IndexError):
+            return f"STR#{v.text}"
+    return v.text
+
+
+def iter_rows(file_path, sheet=SHEET1):
+    """Yield each row of a worksheet as a list of strings.
+
+    The sheet is parsed incrementally and every <row> is dropped from the tree
+    as soon as it has been yielded, so memory stays flat regardless of sheet
+    size. Cells skipped by Excel (empty cells) are padded with "" using the
+    cell reference, so column positions always line up with the header.
+    """
+    with zipfile.ZipFile(file_path, 'r') as z:
+        if sheet not in z.namelist():
+            raise KeyError(f"{sheet} not found in xlsx")
+        strings = read_shared_strings(z)
+        with z.open(sheet) as f:
+            parent = None
+            for event, elem in ET.iterparse(f, events=('start', 'end')):
+                if event == 'start':
+                    if elem.tag == NS + 'sheetData':
+                        parent = elem
+                    continue
+                if elem.tag != NS + 'row':
+                    continue
+                row = []
+                for c in elem.iter(NS + 'c'):
+                    ref = c.get('r')
+                    if ref:
+                        idx = column_index(ref)
+                        if idx > len(row):
+                            row.extend([""] * (idx - len(row)))
+                    row.append(_cell_value(c, strings))
+                elem.clear()
+                if parent is not None:
+                    parent.clear()
+                yield row